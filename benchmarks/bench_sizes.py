@@ -0,0 +1,90 @@
+"""
+Benchmark sudoku_solver on generated boards of every size: 9x9, 16x16 and 25x25.
+
+The data files only hold 9x9 boards, so the boards are made here: a filled board built from a pattern is shuffled
+(values relabelled, rows and columns swapped within their bands and stacks, bands and stacks swapped) and a fraction of
+its cells are emptied. The seed is fixed, so every run solves the same boards.
+
+Usage:
+    python benchmarks/bench_sizes.py --engine bitmask --count 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")))
+
+from sudoku_solver import solver  # noqa: E402
+
+# Board size -> fraction of cells emptied. Larger boards keep more givens, so that every board solves in well under a
+# second with either engine
+EMPTIED = {9: 0.6, 16: 0.55, 25: 0.4}
+
+
+def generate(size, count, emptied, seed=0):
+    """
+    Make puzzles by emptying cells of shuffled filled boards. A puzzle may have more than one solution.
+    :param size: 9, 16 or 25
+    :param count: number of puzzles
+    :param emptied: fraction of cells emptied
+    :param seed: random seed
+    :return: (count, size, size) int8 array of puzzles
+    """
+    rng = np.random.default_rng(seed)
+    box = int(size ** 0.5)
+    rows, columns = np.indices((size, size))
+    filled = (box * (rows % box) + rows // box + columns) % size + 1
+
+    puzzles = np.empty((count, size, size), dtype=np.int8)
+    for index in range(count):
+        board = (rng.permutation(size) + 1)[filled - 1]
+        order = [np.concatenate([band * box + rng.permutation(box) for band in rng.permutation(box)])
+                 for _ in range(2)]
+        board = board[order[0]][:, order[1]]
+        board[rng.random((size, size)) < emptied] = 0
+        puzzles[index] = board
+    return puzzles
+
+
+def is_solution(puzzle, board):
+    """
+    :return: True if board is a filled, valid board that keeps every given of puzzle
+    """
+    size = len(board)
+    box = int(size ** 0.5)
+    values = set(range(1, size + 1))
+    units = [board[row] for row in range(size)] + [board[:, column] for column in range(size)] + \
+        [board[row:row + box, column:column + box].ravel()
+         for row in range(0, size, box) for column in range(0, size, box)]
+    return all(set(unit.tolist()) == values for unit in units) and bool(((board == puzzle) | (puzzle == 0)).all())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sudoku_solver on generated 9x9, 16x16 and 25x25 boards")
+    parser.add_argument("--engine", default=solver.DEFAULT_ENGINE, choices=solver.ENGINES)
+    parser.add_argument("--count", type=int, default=5, help="boards per size")
+    parser.add_argument("--size", type=int, action="append", choices=sorted(EMPTIED),
+                        help="board size to run (can be repeated), defaults to all")
+    args = parser.parse_args(argv)
+
+    print(f"engine: {args.engine}")
+    print(f"{'size':<6} {'correct':>9} {'p50 ms':>10} {'max ms':>10}")
+    for size in args.size or sorted(EMPTIED):
+        puzzles = generate(size, args.count, EMPTIED[size])
+        times = []
+        correct = 0
+        for puzzle in puzzles:
+            began = time.perf_counter()
+            result = solver.sudoku_solver(puzzle, engine=args.engine)
+            times.append(time.perf_counter() - began)
+            correct += int(is_solution(puzzle, result))
+        print(f"{size:<6} {correct:>4}/{len(puzzles):<4} {np.percentile(times, 50) * 1000:>10.2f} "
+              f"{max(times) * 1000:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
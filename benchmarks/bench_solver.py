@@ -0,0 +1,195 @@
+"""
+Benchmark sudoku_solver on every board of the very_easy, easy, medium and hard data files.
+
+For each difficulty this records solve time percentiles (p50/p95/max), set_value calls, backtracks, peak memory and
+how many boards match the solution file, and saves the results as JSON. Two saved runs can be compared, flagging any
+metric that got worse by more than a threshold.
+
+Usage:
+    python benchmarks/bench_solver.py run --engine bitmask --output results.json
+    python benchmarks/bench_solver.py run --technique all --output advanced.json
+    python benchmarks/bench_solver.py compare before.json after.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")))
+
+from sudoku_solver import solver  # noqa: E402
+from sudoku_solver.bitmask import ALL_TECHNIQUES, DEFAULT_TECHNIQUES  # noqa: E402
+from sudoku_solver.data import DIFFICULTIES, load_puzzles, load_solutions  # noqa: E402
+from sudoku_solver.stats import SolveStats  # noqa: E402
+
+# Metrics compared between runs, higher is worse for all of them
+COMPARED_METRICS = ("p50", "p95", "max", "set_value_calls", "backtracks", "peak_memory_bytes")
+
+
+def benchmark_difficulty(difficulty, engine, repeat=1, memory=True, techniques=None):
+    """
+    Solve every board of one difficulty
+    :param difficulty: one of DIFFICULTIES
+    :param engine: engine passed to sudoku_solver
+    :param techniques: techniques passed to sudoku_solver (bitmask engine only), None for the default ones
+    :param repeat: number of times each board is timed; the fastest time is kept
+    :param memory: if True, solve every board once more under tracemalloc to find the peak memory (peak_memory_bytes)
+    :return: dict of results
+    """
+    puzzles = load_puzzles(difficulty)
+    solutions = load_solutions(difficulty)
+    times = []
+    correct = 0
+    stats = SolveStats()
+
+    for puzzle, solution in zip(puzzles, solutions):
+        best = float("inf")
+        for _ in range(repeat):
+            board = puzzle.copy()
+            began = time.perf_counter()
+            result = solver.sudoku_solver(board, engine=engine, techniques=techniques)
+            best = min(best, time.perf_counter() - began)
+        times.append(best)
+        correct += int(np.array_equal(result, solution))
+
+    # Stats slow the solver down, so they are recorded on a separate pass from the timing
+    for puzzle in puzzles:
+        solver.sudoku_solver(puzzle.copy(), engine=engine, stats=stats, techniques=techniques)
+
+    result = {
+        "puzzles": len(puzzles),
+        "correct": correct,
+        "p50": float(np.percentile(times, 50)),
+        "p95": float(np.percentile(times, 95)),
+        "max": max(times),
+        "total": sum(times),
+        "set_value_calls": stats.set_value_calls,
+        "backtracks": stats.backtracks,
+        "nodes": stats.nodes,
+        "invalid_checks": stats.invalid_checks,
+        "placements": dict(stats.placements),
+        "eliminations": dict(stats.eliminations),
+        "fired": dict(stats.fired),
+        "technique_seconds": dict(stats.time),
+    }
+
+    # Left out when not measured, so compare skips it instead of seeing a drop to 0
+    if memory:
+        peak_memory = 0
+        for puzzle in puzzles:
+            tracemalloc.start()
+            solver.sudoku_solver(puzzle.copy(), engine=engine, techniques=techniques)
+            peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        result["peak_memory_bytes"] = peak_memory
+    return result
+
+
+def run(engine=solver.DEFAULT_ENGINE, difficulties=DIFFICULTIES, repeat=1, memory=True, techniques=None):
+    """
+    Benchmark every difficulty
+    :return: dict of results, ready to be saved as JSON
+    """
+    return {
+        "engine": engine,
+        "techniques": None if techniques is None else list(techniques),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "difficulties": {
+            difficulty: benchmark_difficulty(difficulty, engine, repeat, memory, techniques)
+            for difficulty in difficulties
+        },
+    }
+
+
+def compare(before, after, threshold=0.1):
+    """
+    Compare two benchmark results
+    :param before: results of the baseline run
+    :param after: results of the new run
+    :param threshold: relative increase (0.1 = 10%) above which a metric is flagged as a regression
+    :return: list of (difficulty, metric, before value, after value, relative change, regressed) tuples
+    """
+    rows = []
+    for difficulty, new in after["difficulties"].items():
+        old = before["difficulties"].get(difficulty)
+        if old is None:
+            continue
+        # Solving fewer boards correctly is always a regression
+        rows.append((difficulty, "correct", old["correct"], new["correct"], 0.0, new["correct"] < old["correct"]))
+        for metric in COMPARED_METRICS:
+            if metric not in old or metric not in new:
+                continue
+            change = (new[metric] - old[metric]) / old[metric] if old[metric] else (1.0 if new[metric] else 0.0)
+            rows.append((difficulty, metric, old[metric], new[metric], change, change > threshold))
+    return rows
+
+
+def print_results(results):
+    print(f"engine: {results['engine']}, python {results['python']}, numpy {results['numpy']}")
+    print(f"{'difficulty':<10} {'correct':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'set_value':>10} "
+          f"{'backtracks':>10} {'peak KiB':>9}")
+    for difficulty, result in results["difficulties"].items():
+        peak_memory = f"{result['peak_memory_bytes'] / 1024:.1f}" if "peak_memory_bytes" in result else "-"
+        print(f"{difficulty:<10} {result['correct']:>4}/{result['puzzles']:<4} {result['p50'] * 1000:>9.2f} "
+              f"{result['p95'] * 1000:>9.2f} {result['max'] * 1000:>9.2f} {result['set_value_calls']:>10} "
+              f"{result['backtracks']:>10} {peak_memory:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sudoku_solver on the data files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="benchmark the solver and save the results")
+    run_parser.add_argument("--engine", default=solver.DEFAULT_ENGINE, choices=solver.ENGINES)
+    run_parser.add_argument("--difficulty", action="append", choices=DIFFICULTIES,
+                            help="difficulty to run (can be repeated), defaults to all")
+    run_parser.add_argument("--repeat", type=int, default=1, help="times each board is timed, fastest is kept")
+    run_parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    run_parser.add_argument("--output", help="JSON file to save the results to")
+    run_parser.add_argument("--technique", action="append", choices=ALL_TECHNIQUES + ("all",),
+                            help="deduction technique for the bitmask engine (can be repeated, 'all' for every one), "
+                                 "defaults to " + ", ".join(DEFAULT_TECHNIQUES))
+
+    compare_parser = commands.add_parser("compare", help="compare two saved runs")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="relative increase flagged as a regression (default 0.1 = 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        techniques = args.technique
+        if techniques is not None and "all" in techniques:
+            techniques = ALL_TECHNIQUES
+        results = run(args.engine, tuple(args.difficulty or DIFFICULTIES), args.repeat, not args.no_memory, techniques)
+        print_results(results)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+        return 0
+
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+
+    rows = compare(before, after, args.threshold)
+    for difficulty, metric, old, new, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{difficulty:<10} {metric:<18} {old:>14.6g} {new:>14.6g} {change:>+8.1%} {flag}")
+    regressions = sum(row[-1] for row in rows)
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+"""
+Measure the cold import time of the sudoku_solver package.
+Each import runs in a fresh interpreter, so nothing is cached between runs. numpy is timed on its own as well, as it
+makes up most of the import.
+
+Usage: python benchmarks/import_time.py [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+TIMER = "import time; began = time.perf_counter(); import {module}; print(time.perf_counter() - began)"
+
+
+def time_import(module, runs):
+    """
+    Import a module in a new interpreter runs times
+    :param module: name of the module to import
+    :param runs: number of interpreters to start
+    :return: list of import times in seconds
+    """
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    times = []
+    for _ in range(runs):
+        # Run from the root directory, so a working directory relative path would not find the data folder
+        output = subprocess.run([sys.executable, "-c", TIMER.format(module=module)], env=env, cwd=os.sep,
+                                check=True, capture_output=True, text=True).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold import time of sudoku_solver")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for module in ("numpy", "sudoku_solver"):
+        times = time_import(module, args.runs)
+        print(f"import {module}: median {statistics.median(times) * 1000:.1f}ms, "
+              f"min {min(times) * 1000:.1f}ms, max {max(times) * 1000:.1f}ms over {args.runs} runs")
+
+
+if __name__ == "__main__":
+    main()
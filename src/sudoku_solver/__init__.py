@@ -0,0 +1,42 @@
+"""
+Sudoku solver using depth first search with constraint propagation.
+
+Importing the package has no side effects; the demo lives in __main__ (python -m sudoku_solver) and the data files
+are only read when load_puzzles / load_solutions are called. The parallel, store and cli modules (multiprocessing,
+sqlite3 and the command line solver) are not imported until asked for.
+"""
+from .batch import solve_batch
+from .bitmask import BitmaskSudokuSolver, bitmask_depth_first_search
+from .budget import SearchBudget
+from .cache import TranspositionCache
+from .counting import count_solutions, count_solutions_batch
+from .data import DIFFICULTIES, load_puzzles, load_solutions
+from .dlx import DancingLinksSolver, dlx_depth_first_search
+from .solver import (DEFAULT_ENGINE, ENGINES, SudokuSolver, depth_first_search, order_values, pick_next_cell,
+                     sudoku_solver)
+from .stats import SolveStats
+from .symmetry import canonical_form
+
+__all__ = [
+    "BitmaskSudokuSolver",
+    "DEFAULT_ENGINE",
+    "DIFFICULTIES",
+    "DancingLinksSolver",
+    "ENGINES",
+    "SearchBudget",
+    "SolveStats",
+    "SudokuSolver",
+    "TranspositionCache",
+    "bitmask_depth_first_search",
+    "canonical_form",
+    "count_solutions",
+    "count_solutions_batch",
+    "depth_first_search",
+    "dlx_depth_first_search",
+    "load_puzzles",
+    "load_solutions",
+    "order_values",
+    "pick_next_cell",
+    "solve_batch",
+    "sudoku_solver",
+]
@@ -0,0 +1,56 @@
+import argparse
+import sys
+
+import numpy as np
+
+from .data import DIFFICULTIES, load_puzzles, load_solutions
+from .solver import DEFAULT_ENGINE, ENGINES, sudoku_solver
+
+
+def main(argv=None):
+    """
+    python -m sudoku_solver solve ... runs the batch solver (see cli.solve_command); anything else runs the demo.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["solve"]:
+        # Imported here so the demo does not pay for multiprocessing
+        from .cli import solve_command
+        return solve_command(argv[1:])
+    return demo(argv)
+
+
+def demo(argv=None):
+    """
+    Demo: print a puzzle from the data folder, its expected solution, and the solver's answer.
+    Use "python -m sudoku_solver solve --help" to solve files of puzzles.
+    """
+    parser = argparse.ArgumentParser(prog="python -m sudoku_solver", description=demo.__doc__)
+    parser.add_argument("difficulty", nargs="?", default="hard", choices=DIFFICULTIES)
+    parser.add_argument("index", nargs="?", default=7, type=int, help="index of the puzzle in the file")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, choices=ENGINES)
+    args = parser.parse_args(argv)
+
+    # Load sudokus
+    sudoku = load_puzzles(args.difficulty)
+    print(f"{args.difficulty}_puzzle.npy has been loaded into the variable sudoku")
+    print(f"sudoku.shape: {sudoku.shape}, sudoku[0].shape: {sudoku[args.index].shape}, sudoku.dtype: {sudoku.dtype}")
+
+    # Load solutions for demonstration
+    solutions = load_solutions(args.difficulty)
+    print()
+
+    print("Sudoku:")
+    print(sudoku[args.index], "\n")
+
+    print("Expected solution:")
+    print(solutions[args.index], "\n")
+
+    print("Solver's solution:")
+    solution = sudoku_solver(sudoku[args.index].copy(), engine=args.engine)
+    print(solution)
+
+    return 0 if np.array_equal(solution, solutions[args.index]) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
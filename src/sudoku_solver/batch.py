@@ -0,0 +1,133 @@
+import numpy as np
+
+from .solver import sudoku_solver
+
+
+def batch_candidates(boards):
+    """
+    Build the candidate tensor for a stack of boards and find boards that break the rules.
+    :param boards: (N, 9, 9) integer array, 0 for empty cells
+    :return: (candidates, invalid); candidates is an (N, 9, 9, 9) bool array where candidates[n, row, column, value - 1]
+        is True if value can go in the cell (a filled cell's only candidate is its value), invalid is an (N,) bool array
+    """
+    n = len(boards)
+    placed = boards[..., None] == np.arange(1, 10)
+    empty = boards == 0
+
+    # Number of times each value is placed in every row, column and square
+    in_row = placed.sum(axis=2)
+    in_column = placed.sum(axis=1)
+    in_square = placed.reshape(n, 3, 3, 3, 3, 9).sum(axis=(2, 4))
+
+    used = (in_row[:, :, None, :] > 0) | (in_column[:, None, :, :] > 0) | \
+        np.repeat(np.repeat(in_square > 0, 3, axis=1), 3, axis=2)
+    candidates = placed | (empty[..., None] & ~used)
+
+    possible_in_row = candidates.any(axis=2)
+    possible_in_column = candidates.any(axis=1)
+    possible_in_square = candidates.reshape(n, 3, 3, 3, 3, 9).any(axis=(2, 4))
+
+    invalid = (in_row > 1).any(axis=(1, 2)) | (in_column > 1).any(axis=(1, 2)) | (in_square > 1).any(axis=(1, 2, 3))
+    # a cell with no candidates, or a value with nowhere to go in a row, column or square
+    invalid |= (empty & ~candidates.any(axis=3)).any(axis=(1, 2))
+    invalid |= ~possible_in_row.all(axis=(1, 2)) | ~possible_in_column.all(axis=(1, 2)) | \
+        ~possible_in_square.all(axis=(1, 2, 3))
+    # values outside of 0..9
+    invalid |= ((boards < 0) | (boards > 9)).any(axis=(1, 2))
+
+    return candidates, invalid
+
+
+def batch_singles(boards, candidates):
+    """
+    Find every naked single and hidden single (per row, column and square) in a stack of boards at once.
+    :param boards: (N, 9, 9) integer array, 0 for empty cells
+    :param candidates: (N, 9, 9, 9) bool array from batch_candidates
+    :return: (N, 9, 9, 9) bool array, True where the value can be placed in the cell
+    """
+    n = len(boards)
+    empty = (boards == 0)[..., None]
+    open_candidates = candidates & empty
+
+    naked = open_candidates & (candidates.sum(axis=3) == 1)[..., None]
+
+    # A value that is possible in exactly one cell of a unit, and that cell is not already filled
+    hidden_row = open_candidates & (candidates.sum(axis=2) == 1)[:, :, None, :]
+    hidden_column = open_candidates & (candidates.sum(axis=1) == 1)[:, None, :, :]
+    square_count = candidates.reshape(n, 3, 3, 3, 3, 9).sum(axis=(2, 4))
+    hidden_square = open_candidates & np.repeat(np.repeat(square_count == 1, 3, axis=1), 3, axis=2)
+
+    return naked | hidden_row | hidden_column | hidden_square
+
+
+def propagate_batch(puzzles):
+    """
+    Place every naked single and hidden single in a stack of boards, over and over, until none are left.
+    Constraint propagation is run on every board at once as numpy operations on an (N, 9, 9, 9) candidate tensor.
+    :param puzzles: (N, 9, 9) numpy array, 0 for empty cells
+    :return: (boards, invalid); boards is an (N, 9, 9) int64 array with the singles placed, and invalid an (N,) bool
+        array, True for boards found to have no solution
+    """
+    puzzles = np.asarray(puzzles)
+    if puzzles.ndim != 3 or puzzles.shape[1:] != (9, 9):
+        raise ValueError(f"Expected an array of shape (N, 9, 9), got {puzzles.shape}")
+
+    boards = puzzles.astype(np.int64)
+    invalid = np.zeros(len(boards), dtype=bool)
+    # Boards that are neither finished nor known to be invalid
+    active = np.flatnonzero((boards == 0).any(axis=(1, 2)))
+
+    # Check finished boards are valid
+    finished = np.flatnonzero(~(boards == 0).any(axis=(1, 2)))
+    if len(finished):
+        invalid[finished] = batch_candidates(boards[finished])[1]
+
+    while len(active):
+        active_boards = boards[active]
+        candidates, active_invalid = batch_candidates(active_boards)
+        singles = batch_singles(active_boards, candidates)
+
+        # Two different values forced into one cell
+        active_invalid |= (singles.sum(axis=3) > 1).any(axis=(1, 2))
+        invalid[active] = active_invalid
+
+        progress = singles.any(axis=(1, 2, 3)) & ~active_invalid
+        if not progress.any():
+            break
+        active = active[progress]
+        singles = singles[progress]
+        filled = singles.any(axis=3)
+        active_boards = active_boards[progress]
+        active_boards[filled] = singles.argmax(axis=3)[filled] + 1
+        # Boards finished by these placements stay active for one more round, so they are checked
+        boards[active] = active_boards
+
+    return boards, invalid
+
+
+def solve_batch(puzzles, cache=None):
+    """
+    Solves a stack of Sudoku puzzles.
+    Constraint propagation (naked singles and hidden singles) is run on every board at once by propagate_batch. Only
+    boards that are still unfinished afterwards are passed to sudoku_solver.
+
+    Input
+        puzzles : (N, 9, 9) numpy array
+            Empty cells are designated by 0.
+        cache : None or TranspositionCache
+            Passed to sudoku_solver for the boards that need search, so boards repeated within the batch (or seen in
+            an earlier batch) are only searched once.
+
+    Output
+        (N, 9, 9) numpy array, same dtype as puzzles
+            Each board contains its solution, if there is one. If there is no solution, all its entries are -1.
+    """
+    puzzles = np.asarray(puzzles)
+    boards, invalid = propagate_batch(puzzles)
+
+    # Anything left unfinished needs search
+    for index in np.flatnonzero(~invalid & (boards == 0).any(axis=(1, 2))):
+        boards[index] = sudoku_solver(boards[index], engine="bitmask", cache=cache)
+
+    boards[invalid] = -1
+    return boards.astype(puzzles.dtype)
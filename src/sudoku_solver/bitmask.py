@@ -0,0 +1,651 @@
+from array import array
+from itertools import combinations
+
+import numpy as np
+
+from .geometry import board_geometry
+from .stats import leave_nodes
+
+# Bitmask engine
+# Candidates for a cell are held as an N-bit integer, where bit (value - 1) being set means value is still possible.
+# Cells are indexed 0..N*N-1, left to right, top to bottom (index = row * N + column). 9x9 boards use 9-bit masks in
+# 16-bit arrays; larger boards use wider arrays (see geometry.Geometry).
+
+# Techniques propagate can run, in the order they are tried; after any of them changes the state, propagate starts
+# again from the first. DEFAULT_TECHNIQUES are the ones the engine has always used; ALL_TECHNIQUES adds the advanced
+# ones, which cost more per call but can leave less to guess on hard puzzles.
+ALL_TECHNIQUES = ("naked_single", "hidden_single", "naked_pair", "pointing", "box_line", "naked_triple",
+                  "hidden_triple", "naked_quad", "hidden_quad", "x_wing", "swordfish")
+DEFAULT_TECHNIQUES = ("naked_single", "hidden_single", "naked_pair")
+
+
+class BitmaskSudokuSolver:
+    def __init__(self, board):
+        """
+        setups board, flat array of candidate masks
+        :param board: square numpy board, of any size supported by geometry (9x9, 16x16, 25x25, ...)
+        """
+        self.geometry = geometry = board_geometry(board)
+        self.impossible = np.full(geometry.shape, -1, dtype=int)
+        self.board = board
+        values = board.ravel()
+        # A value outside 0..size may not fit a signed byte, so such a board is invalid and its cells are left empty
+        self.invalid = bool(((values < 0) | (values > geometry.size)).any())
+        self.cells = array("b", bytes(geometry.cell_count)) if self.invalid else array("b", map(int, values))
+        # Every value is possible in every cell until setup is run
+        self.candidates = array(geometry.typecode, [geometry.all_values]) * geometry.cell_count
+        # SolveStats shared by every state of the search, or None to not record any
+        self.stats = None
+        # TranspositionCache shared by every state of the search, or None to not remember dead states
+        self.cache = None
+        # Names of the techniques propagate runs (see ALL_TECHNIQUES)
+        self.techniques = DEFAULT_TECHNIQUES
+
+    @property
+    def final_board(self):
+        """
+        Build the numpy board from the flat cell array
+        :return: board with the same dtype as the input, or the -1 board if the state is invalid
+        """
+        if self.invalid:
+            return self.impossible
+        return np.array(self.cells, dtype=self.board.dtype).reshape(self.geometry.shape)
+
+    def copy(self):
+        """
+        Cheap copy of the state; only the two flat arrays are duplicated
+        :return: new BitmaskSudokuSolver sharing the input board
+        """
+        state = BitmaskSudokuSolver.__new__(BitmaskSudokuSolver)
+        state.geometry = self.geometry
+        state.impossible = self.impossible
+        state.board = self.board
+        state.cells = self.cells[:]
+        state.candidates = self.candidates[:]
+        state.invalid = self.invalid
+        state.stats = self.stats
+        state.cache = self.cache
+        state.techniques = self.techniques
+        return state
+
+    def setup(self):
+        """
+        Will setup the candidate masks. A given value clears its bit from every peer, and a given that clashes with a peer
+        makes the board invalid. Nothing is done for a board that was out of range.
+        """
+        if self.invalid:
+            return
+        geometry = self.geometry
+        peers = geometry.peers
+        value_bits = geometry.value_bits
+        cells = self.cells
+        candidates = self.candidates
+
+        for cell in range(geometry.cell_count):
+            value = cells[cell]
+            if value == 0:
+                continue
+            if any(cells[peer] == value for peer in peers[cell]):
+                self.invalid = True
+                return
+            candidates[cell] = value_bits[value]
+
+        for cell in range(geometry.cell_count):
+            if cells[cell] != 0:
+                continue
+            mask = geometry.all_values
+            for peer in peers[cell]:
+                mask &= ~value_bits[cells[peer]]
+            candidates[cell] = mask
+            if mask == 0:
+                self.invalid = True
+                return
+
+    def is_goal(self):
+        """
+        :return: True if every cell has been filled and the state is valid
+        """
+        return not self.invalid and 0 not in self.cells
+
+    def is_invalid(self):
+        """
+        :return: True if a contradiction has been found for this state
+        """
+        if self.stats is not None:
+            self.stats.invalid_checks += 1
+        return self.invalid
+
+    def get_possible_values(self, row, column):
+        """
+        Get the possible values for a given cell
+        :param row: row index (0..N-1)
+        :param column: column index (0..N-1)
+        :return: A list of all potential values at given cell
+        """
+        size = self.geometry.size
+        if not (0 <= row < size and 0 <= column < size):
+            raise ValueError(f"Invalid index for selecting row: {row} and column: {column}")
+
+        return list(self.geometry.mask_values[self.candidates[row * size + column]])
+
+    def count_candidates(self):
+        """
+        :return: Total number of possible values over all cells
+        """
+        popcount = self.geometry.popcount
+        return sum(popcount[mask] for mask in self.candidates)
+
+    def get_singleton_cells(self):
+        """
+        Returns the row and column indexes which have no final value but exactly 1 possible value
+        :return: Array containing the above. Order is left to right, top to bottom
+        """
+        geometry = self.geometry
+        return [divmod(cell, geometry.size) for cell in range(geometry.cell_count)
+                if self.cells[cell] == 0 and geometry.popcount[self.candidates[cell]] == 1]
+
+    def assign(self, cell, value, technique="guess"):
+        """
+        Place a value in a cell and clear it from the candidates of the cell's peers (AND-NOT of the value's bit).
+        :param cell: flat cell index (0..N*N-1)
+        :param value: value to place into board
+        :param technique: what placed the value, for stats
+        :return: False if the placement leads to a contradiction, else True
+        """
+        geometry = self.geometry
+        bit = geometry.value_bits[value]
+        candidates = self.candidates
+        if not candidates[cell] & bit:
+            self.invalid = True
+            return False
+        if self.stats is not None:
+            row, column = divmod(cell, geometry.size)
+            self.stats.placed(row, column, value, technique)
+
+        self.cells[cell] = value
+        candidates[cell] = bit
+        for peer in geometry.peers[cell]:
+            mask = candidates[peer]
+            if mask & bit:
+                mask &= ~bit
+                candidates[peer] = mask
+                if mask == 0:
+                    self.invalid = True
+                    return False
+        return True
+
+    def solve_hidden_singles(self):
+        """
+        Place every value that can only go in one cell of a row, column or square.
+        :return: True if a value was placed
+        """
+        geometry = self.geometry
+        all_values = geometry.all_values
+        popcount = geometry.popcount
+        mask_values = geometry.mask_values
+        cells = self.cells
+        candidates = self.candidates
+        placed = False
+
+        for unit in geometry.units:
+            # once holds bits seen in at least one cell, twice holds bits seen in at least two
+            once = twice = 0
+            for cell in unit:
+                mask = candidates[cell]
+                twice |= once & mask
+                once |= mask
+            if once != all_values:  # a value has nowhere to go in this unit
+                self.invalid = True
+                return placed
+            hidden = once & ~twice
+            if not hidden:
+                continue
+            for cell in unit:
+                mask = candidates[cell] & hidden
+                if mask and cells[cell] == 0:
+                    if popcount[mask] != 1:  # two values can only go in this one cell
+                        self.invalid = True
+                        return placed
+                    if not self.assign(cell, mask_values[mask][0], "hidden_single"):
+                        return placed
+                    placed = True
+
+        return placed
+
+    def solve_naked_pairs(self):
+        """
+        A naked pair is two unfilled cells in the same unit with the same 2-bit mask; both bits are cleared from the rest
+        of the unit.
+        :return: True if any candidate was removed
+        """
+        popcount = self.geometry.popcount
+        cells = self.cells
+        candidates = self.candidates
+        removed = False
+
+        for unit in self.geometry.units:
+            pairs = {}
+            for cell in unit:
+                mask = candidates[cell]
+                if popcount[mask] != 2 or cells[cell] != 0:
+                    continue
+                if mask not in pairs:
+                    pairs[mask] = cell
+                    continue
+                # Found a naked pair
+                for other in unit:
+                    if other == cell or other == pairs[mask] or not candidates[other] & mask:
+                        continue
+                    candidates[other] &= ~mask
+                    removed = True
+                    if candidates[other] == 0:
+                        self.invalid = True
+                        return removed
+
+        return removed
+
+    def solve_naked_singles(self):
+        """
+        Place the only possible value of every unfilled cell that has one
+        :return: True if a value was placed
+        """
+        popcount = self.geometry.popcount
+        mask_values = self.geometry.mask_values
+        cells = self.cells
+        candidates = self.candidates
+        placed = False
+
+        for cell in range(self.geometry.cell_count):
+            if cells[cell] == 0 and popcount[candidates[cell]] == 1:
+                if not self.assign(cell, mask_values[candidates[cell]][0], "naked_single"):
+                    return placed
+                placed = True
+
+        return placed
+
+    def remove_candidates(self, cell, bits):
+        """
+        Clear bits from a cell's candidates
+        :param cell: flat cell index
+        :param bits: mask of the values to remove
+        :return: True if any candidate was removed; the state is marked invalid if none are left
+        """
+        mask = self.candidates[cell]
+        if not mask & bits:
+            return False
+        mask &= ~bits
+        self.candidates[cell] = mask
+        if mask == 0:
+            self.invalid = True
+        return True
+
+    def solve_naked_subsets(self, count):
+        """
+        A naked subset is count unfilled cells in the same unit whose candidates, together, are only count values;
+        those values are cleared from the rest of the unit.
+        :param count: size of the subsets (3 for triples, 4 for quads)
+        :return: True if any candidate was removed
+        """
+        popcount = self.geometry.popcount
+        cells = self.cells
+        candidates = self.candidates
+        removed = False
+
+        for unit in self.geometry.units:
+            options = [cell for cell in unit if cells[cell] == 0 and 2 <= popcount[candidates[cell]] <= count]
+            for subset in combinations(options, count):
+                union = 0
+                for cell in subset:
+                    union |= candidates[cell]
+                size = popcount[union]
+                if size < count:  # count cells with fewer than count values between them
+                    self.invalid = True
+                    return removed
+                if size > count:
+                    continue
+                for other in unit:
+                    if other not in subset and self.remove_candidates(other, union):
+                        removed = True
+                        if self.invalid:
+                            return removed
+
+        return removed
+
+    def solve_hidden_subsets(self, count):
+        """
+        A hidden subset is count values that, in one unit, can only go in the same count cells; every other value is
+        cleared from those cells.
+        :param count: size of the subsets (3 for triples, 4 for quads)
+        :return: True if any candidate was removed
+        """
+        geometry = self.geometry
+        popcount = geometry.popcount
+        value_bits = geometry.value_bits
+        candidates = self.candidates
+        removed = False
+
+        for unit in geometry.units:
+            # positions[value - 1] has bit i set if value can go in the unit's i-th cell
+            positions = [0] * geometry.size
+            for position, cell in enumerate(unit):
+                for value in geometry.mask_values[candidates[cell]]:
+                    positions[value - 1] |= 1 << position
+            options = [value for value in geometry.values if 2 <= popcount[positions[value - 1]] <= count]
+            for subset in combinations(options, count):
+                union = 0
+                for value in subset:
+                    union |= positions[value - 1]
+                size = popcount[union]
+                if size < count:  # count values with fewer than count cells between them
+                    self.invalid = True
+                    return removed
+                if size > count:
+                    continue
+                keep = 0
+                for value in subset:
+                    keep |= value_bits[value]
+                for position, cell in enumerate(unit):
+                    if union >> position & 1 and self.remove_candidates(cell, ~keep & geometry.all_values):
+                        removed = True
+
+        return removed
+
+    def solve_naked_triples(self):
+        return self.solve_naked_subsets(3)
+
+    def solve_naked_quads(self):
+        return self.solve_naked_subsets(4)
+
+    def solve_hidden_triples(self):
+        return self.solve_hidden_subsets(3)
+
+    def solve_hidden_quads(self):
+        return self.solve_hidden_subsets(4)
+
+    def solve_intersections(self, pointing):
+        """
+        Pointing pairs: if a value's candidates in a square all lie in one row (or column), the value is cleared from
+        the rest of that row. Box-line reduction: if a value's candidates in a row (or column) all lie in one square,
+        the value is cleared from the rest of that square.
+        :param pointing: True for pointing pairs, False for box-line reduction
+        :return: True if any candidate was removed
+        """
+        candidates = self.candidates
+        removed = False
+
+        for shared, square_rest, line_rest in self.geometry.intersections:
+            inside = 0
+            for cell in shared:
+                inside |= candidates[cell]
+            source, target = (square_rest, line_rest) if pointing else (line_rest, square_rest)
+            outside = 0
+            for cell in source:
+                outside |= candidates[cell]
+            # Values that can only go in the intersection, as far as source is concerned
+            confined = inside & ~outside
+            if not confined:
+                continue
+            for cell in target:
+                if self.remove_candidates(cell, confined):
+                    removed = True
+                    if self.invalid:
+                        return removed
+
+        return removed
+
+    def solve_pointing(self):
+        return self.solve_intersections(True)
+
+    def solve_box_line(self):
+        return self.solve_intersections(False)
+
+    def solve_fish(self, count):
+        """
+        Basic fish: if, for one value, count rows have all their candidates for the value in the same count columns,
+        the value is cleared from the rest of those columns (and the same with rows and columns swapped). X-wing is
+        count 2, swordfish count 3.
+        :param count: number of rows (or columns) in the fish
+        :return: True if any candidate was removed
+        """
+        geometry = self.geometry
+        size = geometry.size
+        popcount = geometry.popcount
+        candidates = self.candidates
+        removed = False
+
+        for value in geometry.values:
+            bit = geometry.value_bits[value]
+            # by_row[row] has bit column set if value can go in (row, column); by_column the other way round
+            by_row = [0] * size
+            by_column = [0] * size
+            for cell in range(geometry.cell_count):
+                if candidates[cell] & bit:
+                    row, column = divmod(cell, size)
+                    by_row[row] |= 1 << column
+                    by_column[column] |= 1 << row
+
+            for lines, line_cell in ((by_row, lambda line, other: line * size + other),
+                                     (by_column, lambda line, other: other * size + line)):
+                options = [line for line in range(size) if 2 <= popcount[lines[line]] <= count]
+                for subset in combinations(options, count):
+                    union = 0
+                    for line in subset:
+                        union |= lines[line]
+                    covered = popcount[union]
+                    if covered < count:  # count lines with fewer than count places between them for value
+                        self.invalid = True
+                        return removed
+                    if covered > count:
+                        continue
+                    for line in range(size):
+                        if line in subset or not lines[line] & union:
+                            continue
+                        for other in geometry.mask_values[lines[line] & union]:
+                            if self.remove_candidates(line_cell(line, other - 1), bit):
+                                removed = True
+                                if self.invalid:
+                                    return removed
+
+        return removed
+
+    def solve_x_wings(self):
+        return self.solve_fish(2)
+
+    def solve_swordfish(self):
+        return self.solve_fish(3)
+
+    def apply(self, technique, solve):
+        """
+        Run one of the solve_ methods, timing it and counting the candidates it removes if there are stats
+        :param technique: name of the technique, for stats
+        :param solve: bound solve_ method
+        :return: result of solve
+        """
+        stats = self.stats
+        if stats is None:
+            return solve()
+
+        stats.begin(technique)
+        candidates_count = self.count_candidates()
+        changed = solve()
+        stats.eliminations[technique] += candidates_count - self.count_candidates()
+        if changed:
+            stats.fired[technique] += 1
+        stats.end()
+        return changed
+
+    def propagate(self):
+        """
+        Apply the state's techniques in order, starting again from the first whenever one changes the state, until
+        none of them do
+        """
+        while not self.invalid:
+            for technique in self.techniques:
+                if self.apply(technique, getattr(self, TECHNIQUE_METHODS[technique])):
+                    break
+            else:
+                return
+
+    def set_value(self, row, column, value):
+        """
+        Function to place a value in a cell and update constraints in other cells, where appropriate.
+        :param row: row index (0..N-1)
+        :param column: column index (0..N-1)
+        :param value: value to place into board
+        :return: class (type: BitmaskSudokuSolver) with updated board
+        """
+        state = self.copy()
+        if state.invalid:
+            return state
+
+        if state.stats is not None:
+            state.stats.set_value_calls += 1
+        if state.apply("guess", lambda: state.assign(row * state.geometry.size + column, value)):
+            state.propagate()
+
+        return state
+
+    def pick_next_cell(self):
+        """
+        Choose the unfilled cell with the fewest possible values (first one found on a tie)
+        :return: A tuple of form (row, column)
+        """
+        geometry = self.geometry
+        popcount = geometry.popcount
+        cells = self.cells
+        candidates = self.candidates
+        best, best_count = None, geometry.size + 1
+
+        for cell in range(geometry.cell_count):
+            if cells[cell] == 0 and popcount[candidates[cell]] < best_count:
+                best, best_count = cell, popcount[candidates[cell]]
+                if best_count == 1:
+                    break
+
+        return divmod(best, geometry.size)
+
+    def order_values(self, index):
+        """
+        Order the possible values for a cell by the minimum number of times they occur in the cell's row, column and
+        square (same rule as order_values).
+        :param index: A tuple of form (row, column)
+        :return: a tuple of values
+        """
+        geometry = self.geometry
+        cell = index[0] * geometry.size + index[1]
+        cell_units = geometry.cell_units[cell]
+        candidates = self.candidates
+        counts = []
+
+        for value in geometry.mask_values[candidates[cell]]:
+            bit = geometry.value_bits[value]
+            counts.append((min(sum(1 for other in unit if candidates[other] & bit) for unit in cell_units),
+                           value))
+
+        return tuple(value for _, value in sorted(counts, key=lambda x: x[0]))
+
+
+# Technique name -> name of the BitmaskSudokuSolver method that runs it
+TECHNIQUE_METHODS = {
+    "naked_single": "solve_naked_singles",
+    "hidden_single": "solve_hidden_singles",
+    "naked_pair": "solve_naked_pairs",
+    "naked_triple": "solve_naked_triples",
+    "naked_quad": "solve_naked_quads",
+    "hidden_triple": "solve_hidden_triples",
+    "hidden_quad": "solve_hidden_quads",
+    "pointing": "solve_pointing",
+    "box_line": "solve_box_line",
+    "x_wing": "solve_x_wings",
+    "swordfish": "solve_swordfish",
+}
+
+
+def check_techniques(techniques):
+    """
+    :param techniques: iterable of technique names
+    :return: the techniques as a tuple
+    """
+    techniques = tuple(techniques)
+    for technique in techniques:
+        if technique not in TECHNIQUE_METHODS:
+            raise ValueError(f"Unknown technique: {technique}, expected some of {ALL_TECHNIQUES}")
+    return techniques
+
+
+def bitmask_depth_first_search(state, budget=None):
+    """
+    depth_first_search for a BitmaskSudokuSolver; like it, keeps its own stack of nodes rather than recursing.
+    :param state: A BitmaskSudokuSolver class
+    :param budget: optional SearchBudget; if it runs out the search gives up, returning None with budget.exhausted set
+    :return: None if given sudoku has no solution, else returns a finished solution
+    """
+    stats = state.stats
+    cache = state.cache
+    if budget is not None and budget.spend():
+        return None
+    if stats is not None:
+        stats.enter_node(state)
+    if state.is_invalid():
+        if stats is not None:
+            stats.exit_node(state, None)
+        return None
+
+    # One frame per node being searched, root first: [state, cell, values left to try, key of the child searched]
+    stack = [bitmask_frame(state)]
+    while stack:
+        frame = stack[-1]
+        node, index, values, _ = frame
+        value = next(values, None)
+        if value is None:
+            # Every value failed: leave the node, and backtrack in its parent
+            stack.pop()
+            if stats is not None:
+                stats.exit_node(node, None)
+            if stack:
+                key = stack[-1][3]
+                if key is not None:
+                    cache.mark_dead(key)
+                if stats is not None:
+                    stats.backtracks += 1
+            continue
+
+        if stats is not None:
+            stats.values_tried[index] += 1
+        new_state = node.set_value(index[0], index[1], value)
+        if new_state.is_goal():
+            leave_nodes(stack, stats, new_state)
+            return new_state
+        # A state already known to have no solution (a dead state) is skipped
+        if not new_state.is_invalid():
+            key = None if cache is None else new_state.cells.tobytes()
+            if key is None or not cache.is_dead(key):
+                if budget is not None and budget.spend():
+                    leave_nodes(stack, stats, None)
+                    return None
+                if stats is not None:
+                    stats.enter_node(new_state)
+                frame[3] = key
+                stack.append(bitmask_frame(new_state))
+                continue
+        if stats is not None:
+            stats.backtracks += 1
+
+    return None
+
+
+def bitmask_frame(state):
+    """
+    Choose the cell to branch on at a bitmask_depth_first_search node
+    :param state: A BitmaskSudokuSolver class, which is not invalid
+    :return: the node's stack frame
+    """
+    stats = state.stats
+    if stats is not None:
+        stats.begin("search")
+    index = state.pick_next_cell()
+    values = state.order_values(index)
+    if stats is not None:
+        stats.end()
+    return [state, index, iter(values), None]
+
@@ -0,0 +1,50 @@
+import time
+
+# Search budgets
+# A search given a budget counts every node it enters, and gives up once it has entered max_nodes of them or timeout
+# seconds have passed since the budget was made. The clock is read on the first node and then only every
+# CLOCK_INTERVAL nodes, so checking costs an integer increment and a decrement per node; a node takes far longer than
+# the clock can move on in CLOCK_INTERVAL of them.
+CLOCK_INTERVAL = 16
+
+
+class SearchBudget:
+    """
+    Node and time limits for one solve. sudoku_solver(board, max_nodes=..., timeout=...) makes one; the depth first
+    searches take it as their budget argument and call spend() on every node they enter.
+    """
+
+    def __init__(self, max_nodes=None, timeout=None):
+        """
+        :param max_nodes: most search nodes allowed, or None for no limit
+        :param timeout: seconds allowed from now, or None for no limit
+        """
+        if max_nodes is not None and max_nodes < 0:
+            raise ValueError(f"max_nodes must be at least 0, got {max_nodes}")
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {timeout}")
+        self.max_nodes = max_nodes
+        self.timeout = timeout
+        self.deadline = None if timeout is None else time.perf_counter() + timeout
+        self.nodes = 0
+        self.until_clock = 1
+        # None while there is budget left, then "max_nodes" or "timeout"
+        self.exhausted = None
+
+    def spend(self):
+        """
+        Count one node
+        :return: True if the budget has run out, and the search should give up
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.exhausted = "max_nodes"
+            return True
+        if self.deadline is not None:
+            self.until_clock -= 1
+            if not self.until_clock:
+                self.until_clock = CLOCK_INTERVAL
+                if time.perf_counter() > self.deadline:
+                    self.exhausted = "timeout"
+                    return True
+        return False
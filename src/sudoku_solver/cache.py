@@ -0,0 +1,143 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Transposition cache
+# Boards are keyed by their digest: the cells as one signed byte each, left to right, top to bottom (81 bytes for a
+# 9x9 board). This is exact for boards whose values are all in 0..size (see in_range), so two such boards share a key
+# only if they are the same board, and it is the same bytes as BitmaskSudokuSolver.cells, so no hashing is needed
+# during the search. Any other value wraps around in a signed byte (256 becomes 0), so those boards are never looked up
+# or stored.
+# The value stored for a board is the digest of its solution, or NO_SOLUTION if it has none. A board that a search
+# has reached after propagation and found no solution below (a dead sub-state) is stored as NO_SOLUTION too, so the
+# search can skip it when it comes up again, in the same puzzle or a later one.
+NO_SOLUTION = b""
+# Approximate bytes used by one entry on top of its key and value: the two bytes objects' headers and the
+# OrderedDict's hash table slot and linked list node (measured with tracemalloc on CPython 3.11)
+ENTRY_OVERHEAD = 170
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def in_range(board):
+    """
+    :param board: square numpy board
+    :return: True if every value is in 0..size, so board_key is exact for it
+    """
+    board = np.asarray(board)
+    return bool(((board >= 0) & (board <= board.shape[0])).all())
+
+
+def board_key(board):
+    """
+    :param board: numpy board of any size, with every value in 0..size
+    :return: digest of the board, one signed byte per cell
+    """
+    return np.asarray(board).astype(np.int8, copy=False).tobytes()
+
+
+def board_from_key(value, board):
+    """
+    Turn a cached value back into the result sudoku_solver returns for board
+    :param value: solution digest, or NO_SOLUTION
+    :param board: the board that was looked up
+    :return: solution with the same shape and dtype as board, or the -1 board
+    """
+    if value == NO_SOLUTION:
+        return np.full(board.shape, -1, dtype=int)
+    return np.frombuffer(value, dtype=np.int8).reshape(board.shape).astype(board.dtype)
+
+
+class TranspositionCache:
+    """
+    Bounded least recently used map from board digests to solution digests (or NO_SOLUTION).
+    Pass one to sudoku_solver(board, cache=...) to memoise the result of every puzzle and every dead sub-state its
+    search reaches. One cache can be shared by any number of solves, of any engine and board size.
+
+    Memory is bounded by max_bytes: when the estimated size of the entries (key, value and ENTRY_OVERHEAD each) goes
+    over it, the least recently used entries are evicted.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param max_bytes: approximate memory limit of the cache, in bytes
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __deepcopy__(self, memo):
+        # Shared between all states of a search
+        return self
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Look up a board, counting a hit or miss
+        :param key: board digest
+        :return: solution digest, NO_SOLUTION, or None if the board is not in the cache
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Store a board, evicting the least recently used entries if the cache is over max_bytes
+        :param key: board digest
+        :param value: solution digest, or NO_SOLUTION
+        """
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(key) + len(old) + ENTRY_OVERHEAD
+        self.entries[key] = value
+        self.bytes += len(key) + len(value) + ENTRY_OVERHEAD
+
+        while self.bytes > self.max_bytes and self.entries:
+            old_key, old = self.entries.popitem(last=False)
+            self.bytes -= len(old_key) + len(old) + ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def is_dead(self, key):
+        """
+        :param key: board digest of a search state
+        :return: True if the board is known to have no solution
+        """
+        return self.get(key) == NO_SOLUTION
+
+    def mark_dead(self, key):
+        """
+        Remember that a board has no solution
+        :param key: board digest of a search state
+        """
+        self.put(key, NO_SOLUTION)
+
+    def clear(self):
+        """
+        Remove every entry; the counters are kept
+        """
+        self.entries.clear()
+        self.bytes = 0
+
+    def as_dict(self):
+        """
+        :return: the counters as a dict of plain types
+        """
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
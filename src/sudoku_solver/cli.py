@@ -0,0 +1,265 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import numpy as np
+
+from .parallel import solve_chunk, solve_chunks
+from .solver import DEFAULT_ENGINE, ENGINES
+
+# Line format
+# One 9x9 puzzle per line: its 81 cells left to right, top to bottom, 1-9 for givens and 0 or . for empty cells.
+# Blank lines and lines starting with # are skipped. Every puzzle gets one output line, in input order: its solution
+# in the same format, or one of the words below.
+LINE_SIZE = 9
+NO_SOLUTION_LINE = "no solution"
+GAVE_UP_LINE = "gave up"
+INVALID_LINE = "invalid"
+DEFAULT_CHUNK_SIZE = 256
+
+
+def parse_line(line):
+    """
+    :param line: puzzle in the line format, without surrounding whitespace
+    :return: (9, 9) int8 board, or None if the line is not a puzzle
+    """
+    line = line.replace(".", "0")
+    if len(line) != LINE_SIZE * LINE_SIZE or not line.isascii() or not line.isdigit():
+        return None
+    return (np.frombuffer(line.encode("ascii"), dtype=np.uint8) - ord("0")).astype(np.int8).reshape(LINE_SIZE,
+                                                                                                    LINE_SIZE)
+
+
+def format_lines(solutions):
+    """
+    :param solutions: (N, 9, 9) array of results, as returned by solve_chunk
+    :return: list of N output lines: a solution, NO_SOLUTION_LINE for a -1 board or GAVE_UP_LINE for a 0's board
+    """
+    flat = solutions.reshape(len(solutions), -1)
+    digits = (flat + ord("0")).astype(np.uint8)
+    lines = []
+    for board, row in zip(flat, digits):
+        if board[0] == -1:
+            lines.append(NO_SOLUTION_LINE)
+        elif not board.all():
+            lines.append(GAVE_UP_LINE)
+        else:
+            lines.append(row.tobytes().decode("ascii"))
+    return lines
+
+
+def open_input(path):
+    """
+    :param path: path of a text file, or "-" for stdin
+    :return: context manager giving the file
+    """
+    return nullcontext(sys.stdin) if path == "-" else open(path)
+
+
+def read_chunks(paths, chunk_size, invalid):
+    """
+    Read puzzles from text files (in the line format) and .npy stacks, one after another, without holding more than a
+    chunk in memory. .npy files are memory-mapped.
+    :param paths: paths of the input files, "-" for stdin
+    :param chunk_size: number of puzzles per chunk
+    :param invalid: deque; for every line that is not a puzzle, the number of puzzles read before it is appended
+    :return: generator of (start, puzzles) tuples, where start counts the puzzles before the chunk
+    """
+    start = 0
+    boards = []
+    for path in paths:
+        if path.endswith(".npy"):
+            if boards:
+                yield start, np.stack(boards)
+                start += len(boards)
+                boards = []
+            puzzles = np.load(path, mmap_mode="r")
+            for offset in range(0, len(puzzles), chunk_size):
+                chunk = puzzles[offset:offset + chunk_size]
+                yield start, chunk
+                start += len(chunk)
+            continue
+
+        with open_input(path) as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                board = parse_line(line)
+                if board is None:
+                    invalid.append(start + len(boards))
+                    continue
+                boards.append(board)
+                if len(boards) == chunk_size:
+                    yield start, np.stack(boards)
+                    start += len(boards)
+                    boards = []
+    if boards:
+        yield start, np.stack(boards)
+
+
+def read_expected(path):
+    """
+    :param path: solutions as a text file of output lines, or as a .npy stack with -1 boards for no solution
+    :return: generator of the expected output lines
+    """
+    if path.endswith(".npy"):
+        solutions = np.load(path, mmap_mode="r")
+        for offset in range(0, len(solutions), DEFAULT_CHUNK_SIZE):
+            yield from format_lines(np.asarray(solutions[offset:offset + DEFAULT_CHUNK_SIZE]))
+        return
+    with open_input(path) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+class Summary:
+    """
+    Counts the results written by the solve command and checks them against the expected lines, if any
+    """
+
+    def __init__(self, expected=None):
+        """
+        :param expected: iterator of expected output lines, or None not to verify
+        """
+        self.expected = expected
+        self.counts = {"solved": 0, NO_SOLUTION_LINE: 0, GAVE_UP_LINE: 0, INVALID_LINE: 0}
+        self.correct = 0
+        self.wrong = 0
+        self.began = time.perf_counter()
+
+    @property
+    def puzzles(self):
+        return sum(self.counts.values())
+
+    def add(self, line):
+        """
+        Count one output line, and compare it with the next expected line
+        :param line: output line of the next puzzle
+        """
+        self.counts[line if line in self.counts else "solved"] += 1
+        if self.expected is None:
+            return
+        expected = next(self.expected, None)
+        if line == expected:
+            self.correct += 1
+        else:
+            self.wrong += 1
+            print(f"puzzle {self.puzzles}: expected {expected or 'nothing'}, got {line}", file=sys.stderr)
+
+    def finish(self):
+        """
+        Count the expected lines left over after the last puzzle as wrong
+        """
+        if self.expected is None:
+            return
+        extra = sum(1 for _ in self.expected)
+        if extra:
+            self.wrong += extra
+            print(f"{extra} expected lines left after puzzle {self.puzzles}", file=sys.stderr)
+
+    def as_line(self):
+        """
+        :return: one line with the number of puzzles, puzzles/sec and the count of every kind of result
+        """
+        seconds = time.perf_counter() - self.began
+        line = f"{self.puzzles} puzzles in {seconds:.2f}s ({self.puzzles / seconds if seconds else 0.0:.1f} " \
+               f"puzzles/sec): " + ", ".join(f"{count} {kind}" for kind, count in self.counts.items())
+        if self.expected is not None:
+            line += f"; verified {self.correct} correct, {self.wrong} wrong"
+        return line
+
+
+def solve_command(argv=None):
+    """
+    Solve puzzles from text files (81 characters a line, 0 or . for empty cells) or .npy stacks, writing every
+    solution as soon as it, and the ones before it, are done.
+    """
+    parser = argparse.ArgumentParser(prog="python -m sudoku_solver solve", description=solve_command.__doc__)
+    parser.add_argument("inputs", nargs="*", default=["-"], metavar="input",
+                        help="text or .npy file of puzzles, - for stdin (the default)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file to write solutions to, - for stdout (the default); a .npy file if it ends with "
+                             ".npy, which needs every input to be a .npy file")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes, 0 for one per CPU (default 1)")
+    parser.add_argument("--timeout", type=float, help="seconds allowed per puzzle before giving up on it")
+    parser.add_argument("--max-nodes", type=int, help="search nodes allowed per puzzle before giving up on it")
+    parser.add_argument("--verify", metavar="SOLUTIONS",
+                        help="text file of expected output lines, or .npy file of solutions, to check results against")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, choices=ENGINES)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="puzzles sent to a worker at once")
+    args = parser.parse_args(argv)
+
+    if args.jobs < 0 or args.chunk_size < 1 or (args.timeout is not None and args.timeout <= 0) or \
+            (args.max_nodes is not None and args.max_nodes < 0):
+        parser.error("--jobs and --max-nodes must be at least 0, --chunk-size at least 1 and --timeout positive")
+    if args.inputs.count("-") + (args.verify == "-") > 1:
+        parser.error("stdin can only be read once")
+    npy_output = args.output.endswith(".npy")
+    if npy_output and not all(path.endswith(".npy") for path in args.inputs):
+        parser.error("a .npy output needs every input to be a .npy file")
+
+    output = None
+    if npy_output:
+        shapes = [np.load(path, mmap_mode="r").shape for path in args.inputs]
+        if len({shape[1:] for shape in shapes}) != 1:
+            parser.error(f"every .npy input must hold boards of the same size, got shapes {shapes}")
+        dtype = np.load(args.inputs[0], mmap_mode="r").dtype
+        output = np.lib.format.open_memmap(args.output, mode="w+", dtype=dtype,
+                                           shape=(sum(shape[0] for shape in shapes),) + shapes[0][1:])
+    else:
+        for path in args.inputs:
+            if path.endswith(".npy") and np.load(path, mmap_mode="r").shape[1:] != (LINE_SIZE, LINE_SIZE):
+                parser.error(f"{path} does not hold 9x9 boards, which is all the line format can write; use a .npy "
+                             f"output")
+
+    invalid = deque()
+    chunks = read_chunks(args.inputs, args.chunk_size, invalid)
+    if args.jobs == 1:
+        results = ((start, solve_chunk(np.array(puzzles), start, start + len(puzzles), args.engine, args.timeout,
+                                       max_nodes=args.max_nodes)[2])
+                   for start, puzzles in chunks)
+    else:
+        results = solve_chunks(chunks, args.jobs or None, args.timeout, args.engine, max_nodes=args.max_nodes)
+
+    summary = Summary(None if args.verify is None else read_expected(args.verify))
+    try:
+        with nullcontext(sys.stdout) if npy_output or args.output == "-" else open(args.output, "w") as text:
+            for start, solutions in results:
+                if npy_output:
+                    output[start:start + len(solutions)] = solutions
+                lines = []
+                for offset, line in enumerate(format_lines(solutions)):
+                    while invalid and invalid[0] == start + offset:
+                        lines.append(INVALID_LINE)
+                        invalid.popleft()
+                    lines.append(line)
+                for line in lines:
+                    summary.add(line)
+                if not npy_output:
+                    text.write("".join(line + "\n" for line in lines))
+                    text.flush()
+            # Invalid lines after the last puzzle
+            for _ in invalid:
+                summary.add(INVALID_LINE)
+                if not npy_output:
+                    text.write(INVALID_LINE + "\n")
+            text.flush()
+    except BrokenPipeError:
+        # Whatever was reading the output has stopped (e.g. piped into head): stop quietly. stdout is pointed at
+        # devnull so Python does not fail again flushing it on exit
+        results.close()
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+    if npy_output:
+        output.flush()
+        del output
+    summary.finish()
+    print(summary.as_line(), file=sys.stderr)
+    return 1 if summary.wrong else 0
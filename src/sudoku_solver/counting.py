@@ -0,0 +1,107 @@
+import numpy as np
+
+from .batch import propagate_batch
+from .bitmask import BitmaskSudokuSolver
+
+
+def bitmask_count_solutions(state, limit, solutions):
+    """
+    Depth first search that carries on past the first solution, collecting finished states until there are limit of
+    them. Each child state is copied from its parent after the parent's propagation, so that work is shared by every
+    branch below it. Nodes are kept on a stack rather than in recursive calls.
+    :param state: A BitmaskSudokuSolver class
+    :param limit: stop once this many solutions have been found
+    :param solutions: list the finished states are appended to
+    """
+    if state.is_invalid():
+        return
+
+    index = state.pick_next_cell()
+    # (state, cell, values left to try) of every node being searched, root first
+    stack = [(state, index, iter(state.order_values(index)))]
+    while stack:
+        node, index, values = stack[-1]
+        value = next(values, None)
+        if value is None:
+            stack.pop()
+            continue
+        new_state = node.set_value(index[0], index[1], value)
+        if new_state.is_goal():
+            solutions.append(new_state)
+            if len(solutions) >= limit:
+                return
+        elif not new_state.is_invalid():
+            index = new_state.pick_next_cell()
+            stack.append((new_state, index, iter(new_state.order_values(index))))
+
+
+def count_solutions(board, limit=2):
+    """
+    Count the solutions of a Sudoku puzzle, stopping as soon as limit of them have been found.
+    With the default limit of 2, the count tells whether a puzzle has no solution, a unique solution or more than one.
+
+    Input
+        board : 9x9 numpy array
+            Empty cells are designated by 0.
+        limit : int
+            Maximum number of solutions to look for, at least 1.
+
+    Output
+        (count, solution)
+            count is the number of solutions found, between 0 and limit; count == limit means limit or more.
+            solution is the first solution found as a 9x9 numpy array, or all -1 if there is none.
+    """
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+
+    state = BitmaskSudokuSolver(board)
+    state.setup()
+    if state.is_invalid():
+        return 0, state.impossible
+
+    # Propagate once at the root, so every branch starts from it
+    if not state.is_goal():
+        state = state.copy()
+        state.propagate()
+    if state.is_invalid():
+        return 0, state.impossible
+    if state.is_goal():
+        return 1, state.final_board
+
+    solutions = []
+    bitmask_count_solutions(state, limit, solutions)
+    if not solutions:
+        return 0, state.impossible
+    return len(solutions), solutions[0].final_board
+
+
+def count_solutions_batch(puzzles, limit=2):
+    """
+    count_solutions for a stack of puzzles.
+    Singles are first placed on every board at once with propagate_batch; a board that is finished by that has exactly
+    one solution, as singles are always forced. Only the rest are searched one at a time.
+
+    Input
+        puzzles : (N, 9, 9) numpy array
+            Empty cells are designated by 0.
+        limit : int
+            Maximum number of solutions to look for per puzzle, at least 1.
+
+    Output
+        (counts, solutions)
+            counts is an (N,) int array of solution counts, capped at limit.
+            solutions is an (N, 9, 9) array, same dtype as puzzles, of the first solution found for each puzzle (all -1
+            where there is none).
+    """
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+
+    puzzles = np.asarray(puzzles)
+    boards, invalid = propagate_batch(puzzles)
+    counts = np.where(invalid, 0, 1)
+
+    for index in np.flatnonzero(~invalid & (boards == 0).any(axis=(1, 2))):
+        counts[index], boards[index] = count_solutions(boards[index], limit)
+
+    boards[counts == 0] = -1
+    return counts, boards.astype(puzzles.dtype)
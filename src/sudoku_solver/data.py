@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+
+# The data folder at the root of the repository, found from this file rather than the working directory
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "data"))
+DIFFICULTIES = ("very_easy", "easy", "medium", "hard")
+
+
+def data_path(difficulty, kind="puzzle"):
+    """
+    Path of one of the .npy files in the data folder
+    :param difficulty: one of DIFFICULTIES
+    :param kind: "puzzle" or "solution"
+    :return: path to {difficulty}_{kind}.npy
+    """
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty: {difficulty}, expected one of {DIFFICULTIES}")
+    if kind not in ("puzzle", "solution"):
+        raise ValueError(f"Unknown kind: {kind}, expected 'puzzle' or 'solution'")
+
+    return os.path.join(DATA_DIR, f"{difficulty}_{kind}.npy")
+
+
+def load_puzzles(difficulty, mmap_mode=None):
+    """
+    Load the (N, 9, 9) puzzles for a difficulty. Nothing is read until this is called.
+    :param difficulty: one of DIFFICULTIES
+    :param mmap_mode: passed to np.load, e.g. "r" to memory-map the file
+    :return: numpy array of puzzles
+    """
+    return np.load(data_path(difficulty, "puzzle"), mmap_mode=mmap_mode)
+
+
+def load_solutions(difficulty, mmap_mode=None):
+    """
+    Load the (N, 9, 9) solutions for a difficulty; unsolvable puzzles have all -1 solutions
+    :param difficulty: one of DIFFICULTIES
+    :param mmap_mode: passed to np.load, e.g. "r" to memory-map the file
+    :return: numpy array of solutions
+    """
+    return np.load(data_path(difficulty, "solution"), mmap_mode=mmap_mode)
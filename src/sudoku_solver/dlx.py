@@ -0,0 +1,195 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .geometry import board_geometry, get_geometry
+from .stats import leave_nodes
+
+# Exact cover engine (Algorithm X)
+# Sudoku as an exact cover problem: each of the 729 candidates (a value in a cell) covers 4 of the 324 constraints, and
+# a solution is a set of candidates that covers every constraint exactly once. The constraints are:
+#   0..80     each cell holds a value
+#   81..161   each row holds each value
+#   162..242  each column holds each value
+#   243..323  each square holds each value
+# Candidate (row, column, value) has index (row * 9 + column) * 9 + value - 1.
+# The matrix is held as a dict of sets (constraint -> candidates still covering it), which does the same job as dancing
+# links in Python: removing and restoring a candidate is a handful of set operations.
+# An N x N board works the same way, with 4 * N * N constraints and N * N * N candidates.
+
+
+@lru_cache(maxsize=None)
+def exact_cover_tables(size=9):
+    """
+    Build the exact cover matrix of a size x size board, once per size
+    :param size: number of values, rows and columns of the board
+    :return: (candidate -> its 4 constraints, constraint -> frozenset of the candidates covering it)
+    """
+    box = get_geometry(size).box
+    cell_count = size * size
+    candidate_constraints = tuple(
+        (row * size + column,
+         cell_count + row * size + value - 1,
+         2 * cell_count + column * size + value - 1,
+         3 * cell_count + (row // box * box + column // box) * size + value - 1)
+        for row in range(size) for column in range(size) for value in range(1, size + 1)
+    )
+    constraint_candidates = [[] for _ in range(4 * cell_count)]
+    for candidate, constraints in enumerate(candidate_constraints):
+        for constraint in constraints:
+            constraint_candidates[constraint].append(candidate)
+    return candidate_constraints, tuple(frozenset(candidates) for candidates in constraint_candidates)
+
+
+class DancingLinksSolver:
+    def __init__(self, board):
+        """
+        setups board, exact cover matrix with every candidate still available
+        :param board: square numpy board, of any size supported by geometry (9x9, 16x16, 25x25, ...)
+        """
+        self.size = board_geometry(board).size
+        self.candidate_constraints, constraint_candidates = exact_cover_tables(self.size)
+        self.impossible = np.full(board.shape, -1, dtype=int)
+        self.board = board
+        # constraint -> set of candidates that still cover it; constraints are removed once covered
+        self.columns = {constraint: set(candidates) for constraint, candidates in enumerate(constraint_candidates)}
+        # Chosen candidates, givens first
+        self.solution = []
+        self.invalid = False
+        # SolveStats, or None to not record any
+        self.stats = None
+
+    @property
+    def final_board(self):
+        """
+        :return: board with the same dtype as the input, or the -1 board if there is no solution
+        """
+        if self.invalid or not self.is_goal():
+            return self.impossible
+        board = np.zeros(self.size * self.size, dtype=self.board.dtype)
+        for candidate in self.solution:
+            cell, value_index = divmod(candidate, self.size)
+            board[cell] = value_index + 1
+        return board.reshape(self.size, self.size)
+
+    def setup(self):
+        """
+        Choose the candidate of every given value. A given that is out of range, or whose constraint has already been
+        covered by another given, makes the board invalid.
+        """
+        for cell, value in enumerate(self.board.flat):
+            if value == 0:
+                continue
+            if not 0 < value <= self.size:
+                self.invalid = True
+                return
+            candidate = cell * self.size + int(value) - 1
+            if any(constraint not in self.columns for constraint in self.candidate_constraints[candidate]):
+                self.invalid = True
+                return
+            self.select(candidate)
+            self.solution.append(candidate)
+
+    def is_goal(self):
+        """
+        :return: True if every constraint is covered
+        """
+        return not self.columns
+
+    def is_invalid(self):
+        """
+        :return: True if the givens break the rules
+        """
+        if self.stats is not None:
+            self.stats.invalid_checks += 1
+        return self.invalid
+
+    def select(self, candidate):
+        """
+        Cover the constraints of a candidate, removing every other candidate that covers any of them
+        :param candidate: candidate index
+        :return: the removed constraint sets, needed by deselect
+        """
+        columns = self.columns
+        candidate_constraints = self.candidate_constraints
+        removed = []
+        for constraint in candidate_constraints[candidate]:
+            for other in columns[constraint]:
+                for other_constraint in candidate_constraints[other]:
+                    if other_constraint != constraint:
+                        columns[other_constraint].remove(other)
+            removed.append(columns.pop(constraint))
+        return removed
+
+    def deselect(self, candidate, removed):
+        """
+        Undo select, in reverse order
+        :param candidate: candidate index
+        :param removed: return value of the matching select
+        """
+        columns = self.columns
+        candidate_constraints = self.candidate_constraints
+        for constraint in reversed(candidate_constraints[candidate]):
+            columns[constraint] = removed.pop()
+            for other in columns[constraint]:
+                for other_constraint in candidate_constraints[other]:
+                    if other_constraint != constraint:
+                        columns[other_constraint].add(other)
+
+
+def dlx_depth_first_search(state, budget=None):
+    """
+    Algorithm X: cover the constraint with the fewest candidates left, trying each of its candidates in turn.
+    Changes state in place, undoing each choice on backtracking. The choices are kept on a stack rather than in
+    recursive calls.
+    :param state: A DancingLinksSolver class, after setup
+    :param budget: optional SearchBudget; if it runs out the search gives up, returning None with budget.exhausted set
+    :return: None if given sudoku has no solution, else returns the finished state
+    """
+    stats = state.stats
+    columns = state.columns
+    # One frame per node being searched, root first: [state, candidates left to try, (candidate, removed) of the
+    # choice being searched]
+    stack = []
+    while True:
+        # Enter a node: the root, or the one the last choice led to. A finished board costs no budget
+        if state.is_goal():
+            if stats is not None:
+                stats.enter_node(state)
+                stats.exit_node(state, state)
+            leave_nodes(stack, stats, state)
+            return state
+        if budget is not None and budget.spend():
+            leave_nodes(stack, stats, None)
+            return None
+        if stats is not None:
+            stats.enter_node(state)
+        constraint = min(columns, key=lambda key: len(columns[key]))
+        stack.append([state, iter(sorted(columns[constraint])), None])
+
+        # Make the next choice, backtracking out of nodes that have none left
+        while stack:
+            frame = stack[-1]
+            if frame[2] is not None:
+                candidate, removed = frame[2]
+                frame[2] = None
+                state.solution.pop()
+                state.deselect(candidate, removed)
+                if stats is not None:
+                    stats.backtracks += 1
+            candidate = next(frame[1], None)
+            if candidate is not None:
+                break
+            stack.pop()
+            if stats is not None:
+                stats.exit_node(state, None)
+        else:
+            return None
+
+        if stats is not None:
+            cell, value_index = divmod(candidate, state.size)
+            row, column = divmod(cell, state.size)
+            stats.values_tried[(row, column)] += 1
+            stats.placed(row, column, value_index + 1, "guess")
+        frame[2] = (candidate, state.select(candidate))
+        state.solution.append(candidate)
@@ -0,0 +1,117 @@
+from array import array
+from functools import lru_cache
+from math import isqrt
+
+import numpy as np
+
+# Board geometry
+# A board of size N = n * n (9, 16, 25, ...) has N rows, N columns and N squares of n x n cells, holding values 1..N.
+# Cells are indexed 0..N*N-1, left to right, top to bottom (index = row * N + column).
+# The tables below only depend on the size, so they are built once per size and shared by every solver.
+
+# Largest board supported: candidate masks are stored in arrays of unsigned 64-bit integers at most
+MAX_SIZE = 64
+# Unsigned array typecodes, smallest first. Their sizes depend on the platform ("L" is 8 bytes on 64-bit Linux), so
+# every board uses the first one whose itemsize fits its masks: 16-bit for 9x9 and 16x16, 32-bit for 25x25
+MASK_TYPECODES = ("B", "H", "I", "L", "Q")
+# Up to this size popcount and mask -> values are full tuples (2 ** 9 entries); above it they are filled in lazily, as
+# building all 2 ** 16 entries for a 16x16 board would take longer than solving it
+TABLE_SIZE = 9
+
+
+class MaskTable(dict):
+    """
+    Lazily filled mask -> function(mask) table, used in place of a full tuple when there are too many masks to list
+    """
+
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def __missing__(self, mask):
+        value = self[mask] = self.function(mask)
+        return value
+
+
+class Geometry:
+    def __init__(self, size):
+        """
+        Build the unit and peer tables of a size x size board
+        :param size: number of values (9 for a normal sudoku), must be a square number
+        """
+        box = isqrt(size)
+        if size < 1 or box * box != size:
+            raise ValueError(f"Board size must be a square number, got {size}")
+        if size > MAX_SIZE:
+            raise ValueError(f"Boards larger than {MAX_SIZE}x{MAX_SIZE} are not supported, got {size}")
+
+        self.size = size
+        self.box = box
+        self.cell_count = size * size
+        self.shape = (size, size)
+        self.values = tuple(range(1, size + 1))
+
+        # Candidate masks: bit (value - 1) set means value is still possible
+        self.all_values = (1 << size) - 1
+        self.value_bits = (0,) + tuple(1 << (value - 1) for value in self.values)
+        self.typecode = next(code for code in MASK_TYPECODES if array(code).itemsize * 8 >= size)
+        if size <= TABLE_SIZE:
+            self.popcount = tuple(bin(mask).count("1") for mask in range(self.all_values + 1))
+            self.mask_values = tuple(self.bits_to_values(mask) for mask in range(self.all_values + 1))
+        else:
+            self.popcount = MaskTable(int.bit_count)
+            self.mask_values = MaskTable(self.bits_to_values)
+
+        # The 3 * size units (rows, then columns, then squares) and the peers of every cell
+        self.units = tuple(tuple(row * size + column for column in range(size)) for row in range(size)) + \
+            tuple(tuple(row * size + column for row in range(size)) for column in range(size)) + \
+            tuple(tuple((low_vertical + i) * size + low_horizontal + j for i in range(box) for j in range(box))
+                  for low_vertical in range(0, size, box) for low_horizontal in range(0, size, box))
+        self.cell_unit_indexes = tuple(
+            (cell // size, size + cell % size, 2 * size + cell // size // box * box + cell % size // box)
+            for cell in range(self.cell_count))
+        self.cell_units = tuple(tuple(self.units[unit] for unit in units) for units in self.cell_unit_indexes)
+        self.peers = tuple(tuple(sorted({peer for unit in self.cell_units[cell] for peer in unit} - {cell}))
+                           for cell in range(self.cell_count))
+        # Every square crossed with every row and column through it, as (cells in both, rest of the square, rest of
+        # the line), for pointing pairs and box-line reduction
+        self.intersections = tuple(
+            (tuple(sorted(set(square) & set(line))), tuple(sorted(set(square) - set(line))),
+             tuple(sorted(set(line) - set(square))))
+            for square in self.units[2 * size:] for line in self.units[:2 * size] if set(square) & set(line))
+        # The same tables as (row, column) pairs, for the list engine
+        self.unit_cells = tuple(tuple(divmod(cell, size) for cell in unit) for unit in self.units)
+        self.peer_cells = tuple(tuple(divmod(peer, size) for peer in peers) for peers in self.peers)
+        # And as numpy index arrays into the flattened board: (3 * size, size) and (size * size, peers per cell)
+        self.unit_indexes = np.array(self.units)
+        self.peer_indexes = np.array(self.peers)
+
+    def __deepcopy__(self, memo):
+        # Shared by every board of this size
+        return self
+
+    def bits_to_values(self, mask):
+        """
+        :param mask: candidate mask
+        :return: tuple of the values whose bits are set, in increasing order
+        """
+        return tuple(value for value in self.values if mask & self.value_bits[value])
+
+
+@lru_cache(maxsize=None)
+def get_geometry(size=9):
+    """
+    :param size: number of values, rows and columns of the board (9, 16, 25, ...)
+    :return: the Geometry of a size x size board, built on first use and cached
+    """
+    return Geometry(size)
+
+
+def board_geometry(board):
+    """
+    :param board: square numpy board
+    :return: the Geometry matching the board's shape
+    """
+    if board.ndim != 2 or board.shape[0] != board.shape[1]:
+        raise ValueError(f"Expected a square board, got shape {board.shape}")
+    return get_geometry(board.shape[0])
@@ -0,0 +1,232 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from .cache import TranspositionCache
+from .solver import sudoku_solver
+
+# TranspositionCache of a worker process, made by the first chunk that asks for one and kept for the life of the
+# worker, so repeated puzzles are remembered across chunks
+worker_cache = None
+
+
+def get_worker_cache(max_bytes):
+    """
+    :param max_bytes: memory limit of the cache
+    :return: this process's TranspositionCache, made on first use (or remade if max_bytes changed)
+    """
+    global worker_cache
+    if worker_cache is None or worker_cache.max_bytes != max_bytes:
+        worker_cache = TranspositionCache(max_bytes)
+    return worker_cache
+
+
+def solve_chunk(puzzles, start, stop, engine="bitmask", timeout=None, cache_bytes=None, max_nodes=None):
+    """
+    Worker function. Solves a slice of puzzles one at a time.
+    A puzzle that raises, or whose search runs past timeout seconds or max_nodes nodes, is given up on; its board is
+    left as all 0's.
+    :param puzzles: (stop - start, 9, 9) array of puzzles
+    :param start: index of the first puzzle in the whole input
+    :param stop: index after the last puzzle in the whole input
+    :param engine: engine passed to sudoku_solver
+    :param timeout: seconds allowed per puzzle, or None for no limit
+    :param cache_bytes: if given, solve with the worker's TranspositionCache, limited to this many bytes
+    :param max_nodes: search nodes allowed per puzzle, or None for no limit
+    :return: tuple of (start, stop, solutions, failed, seconds, pid, cache counters or None); failed holds indices into
+        the whole input
+    """
+    began = time.perf_counter()
+    solutions = np.zeros_like(puzzles)
+    failed = []
+    cache = None if cache_bytes is None else get_worker_cache(cache_bytes)
+
+    for offset, puzzle in enumerate(puzzles):
+        try:
+            solution = sudoku_solver(puzzle.copy(), engine=engine, cache=cache, max_nodes=max_nodes, timeout=timeout)
+        except Exception:  # anything a bad puzzle can raise
+            failed.append(start + offset)
+            continue
+        # sudoku_solver gives the 0 board when it gives up
+        if not solution.any():
+            failed.append(start + offset)
+        solutions[offset] = solution
+
+    cache_counters = None if cache is None else cache.as_dict()
+    return start, stop, solutions, failed, time.perf_counter() - began, os.getpid(), cache_counters
+
+
+def solve_stream(puzzles, workers=None, chunk_size=256, timeout=None, engine="bitmask", ordered=True, report=None,
+                 cache_bytes=None, max_nodes=None):
+    """
+    Solve puzzles across a pool of processes, yielding solutions as chunks finish.
+    Only a bounded number of chunks (2 per worker) are in flight at once, so puzzles can be a memory-mapped array
+    (np.load(..., mmap_mode="r")) much larger than memory.
+
+    If a worker process dies, the pool is restarted and the chunks that were in flight are retried one at a time.
+    A chunk that still kills its worker is split into single puzzles, and a single puzzle that kills its worker is
+    given up on. Given up puzzles come back as all 0's boards (not -1, which means the puzzle has no solution) and
+    their indices are added to report["failed"].
+
+    :param puzzles: (N, 9, 9) array of puzzles
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :param chunk_size: number of puzzles sent to a worker at once
+    :param timeout: seconds allowed per puzzle, or None for no limit
+    :param engine: engine passed to sudoku_solver
+    :param ordered: if True, chunks are yielded in input order, otherwise as soon as they finish
+    :param report: optional dict, filled in with "failed" indices and per worker "workers" puzzle counts and seconds,
+        and per worker "cache" counters if there is a cache
+    :param cache_bytes: if given, every worker keeps a TranspositionCache of up to this many bytes for its lifetime
+    :param max_nodes: search nodes allowed per puzzle, or None for no limit
+    :return: generator of (start, solutions) tuples, where solutions[i] is the solution of puzzles[start + i]
+    """
+    chunks = ((start, puzzles[start:start + chunk_size]) for start in range(0, len(puzzles), chunk_size))
+    return solve_chunks(chunks, workers, timeout, engine, ordered, report, cache_bytes, max_nodes)
+
+
+def solve_chunks(chunks, workers=None, timeout=None, engine="bitmask", ordered=True, report=None, cache_bytes=None,
+                 max_nodes=None):
+    """
+    Solve chunks of puzzles across a pool of processes, as solve_stream does, taking the chunks from an iterator.
+    Chunks are only taken from the iterator when there is room for them (2 per worker, counting finished chunks held
+    back to keep the input order), so a generator reading a file of any length runs in constant memory.
+    :param chunks: iterable of (start, puzzles) tuples, where puzzles is a (count, size, size) array holding the
+        puzzles start to start + count of the input; the chunks must follow each other
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :param timeout: seconds allowed per puzzle, or None for no limit
+    :param engine: engine passed to sudoku_solver
+    :param ordered: if True, chunks are yielded in input order, otherwise as soon as they finish
+    :param report: optional dict, filled in as in solve_stream
+    :param cache_bytes: if given, every worker keeps a TranspositionCache of up to this many bytes for its lifetime
+    :param max_nodes: search nodes allowed per puzzle, or None for no limit
+    :return: generator of (start, solutions) tuples, where solutions[i] is the solution of the input's puzzle start + i
+    """
+    workers = workers or os.cpu_count()
+    report = {} if report is None else report
+    report.setdefault("failed", [])
+    report.setdefault("workers", {})
+    if cache_bytes is not None:
+        report.setdefault("cache", {})
+
+    chunks = iter(chunks)
+    # Chunks caught in a crashed pool, as (start, puzzles, isolated); retried one at a time
+    retries = deque()
+    pending = {}
+    finished = {}
+    next_start = None
+
+    executor = ProcessPoolExecutor(workers)
+    try:
+        while True:
+            if retries:
+                # Run retried chunks on their own, so a crash can be pinned on the chunk that caused it
+                if not pending:
+                    start, chunk, isolated = retries.popleft()
+                    future = executor.submit(solve_chunk, chunk, start, start + len(chunk), engine, timeout,
+                                             cache_bytes, max_nodes)
+                    pending[future] = (start, chunk, isolated)
+            else:
+                while len(pending) + len(finished) < workers * 2:
+                    start, chunk = next(chunks, (None, None))
+                    if chunk is None:
+                        break
+                    if next_start is None:
+                        next_start = start
+                    chunk = np.ascontiguousarray(chunk)
+                    future = executor.submit(solve_chunk, chunk, start, start + len(chunk), engine, timeout,
+                                             cache_bytes, max_nodes)
+                    pending[future] = (start, chunk, False)
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                start, chunk, isolated = pending.pop(future)
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    if not isolated:
+                        retries.append((start, chunk, True))
+                    elif len(chunk) > 1:
+                        retries.extend((start + offset, chunk[offset:offset + 1], True)
+                                       for offset in range(len(chunk)))
+                    else:
+                        # This puzzle kills its worker on its own; give up on it
+                        result = (start, start + 1, np.zeros_like(chunk), [start], 0.0, None, None)
+                        finished[start] = result
+                    continue
+                finished[start] = result
+
+            if broken:
+                # Every other chunk in the dead pool fails too; queue them to run again in a new pool
+                retries.extend((start, chunk, True) for start, chunk, _ in pending.values())
+                pending.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(workers)
+
+            for start in (sorted(finished) if ordered else list(finished)):
+                if ordered and start != next_start:
+                    break
+                _, stop, solutions, failed, seconds, pid, cache_counters = finished.pop(start)
+                report["failed"].extend(failed)
+                if pid is not None:
+                    count, busy = report["workers"].get(pid, (0, 0.0))
+                    report["workers"][pid] = (count + stop - start, busy + seconds)
+                if cache_counters is not None:
+                    # Counters are totals for the worker's lifetime, so the latest ones are kept
+                    report["cache"][pid] = cache_counters
+                next_start = stop
+                yield start, solutions
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def solve_file(puzzles, output_path, workers=None, chunk_size=256, timeout=None, engine="bitmask", cache_bytes=None,
+               max_nodes=None):
+    """
+    Solve every puzzle in a .npy file (or array) in parallel and write the solutions to a .npy file.
+    The input is memory-mapped and the output is written through a memory-mapped .npy file as chunks finish, so
+    neither is ever held in memory as a whole.
+    :param puzzles: path to an (N, 9, 9) .npy file, or an (N, 9, 9) array (which may be memory-mapped)
+    :param output_path: path of the .npy file to write solutions to
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :param chunk_size: number of puzzles sent to a worker at once
+    :param timeout: seconds allowed per puzzle, or None for no limit
+    :param engine: engine passed to sudoku_solver
+    :param cache_bytes: if given, every worker keeps a TranspositionCache of up to this many bytes
+    :param max_nodes: search nodes allowed per puzzle, or None for no limit
+    :return: report dict with "puzzles", "seconds", "puzzles_per_sec", "failed" (indices of given up puzzles, whose
+        output boards are all 0's) and "workers", mapping worker pid to its "puzzles", "seconds" and "puzzles_per_sec",
+        and with a cache, "cache", mapping worker pid to its cache counters
+    """
+    if isinstance(puzzles, (str, os.PathLike)):
+        puzzles = np.load(puzzles, mmap_mode="r")
+
+    output = np.lib.format.open_memmap(output_path, mode="w+", dtype=puzzles.dtype, shape=puzzles.shape)
+    report = {}
+
+    began = time.perf_counter()
+    for start, solutions in solve_stream(puzzles, workers, chunk_size, timeout, engine, ordered=False, report=report,
+                                         cache_bytes=cache_bytes, max_nodes=max_nodes):
+        output[start:start + len(solutions)] = solutions
+    seconds = time.perf_counter() - began
+
+    output.flush()
+    del output
+
+    report["failed"].sort()
+    report["puzzles"] = len(puzzles)
+    report["seconds"] = seconds
+    report["puzzles_per_sec"] = len(puzzles) / seconds if seconds else 0.0
+    report["workers"] = {
+        pid: {"puzzles": count, "seconds": busy, "puzzles_per_sec": count / busy if busy else 0.0}
+        for pid, (count, busy) in report["workers"].items()
+    }
+    return report
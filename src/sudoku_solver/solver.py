@@ -0,0 +1,709 @@
+import copy
+import gc
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+from .bitmask import BitmaskSudokuSolver, bitmask_depth_first_search, check_techniques
+from .budget import SearchBudget
+from .cache import NO_SOLUTION, board_from_key, board_key, in_range
+from .dlx import DancingLinksSolver, dlx_depth_first_search
+from .geometry import board_geometry
+from .stats import SolveStats, leave_nodes
+
+# Values of sudoku_solver's engine argument
+ENGINES = ("list", "bitmask", "dlx")
+# Fastest engine on every data file, see "Choosing An Engine" in the readme
+DEFAULT_ENGINE = "bitmask"
+
+# Trail entry tags, used by SudokuSolver when depth_first_search runs with trail=True
+TRAIL_REMOVED, TRAIL_PLACED, TRAIL_IMPOSSIBLE, TRAIL_UNITS = range(4)
+
+
+class SudokuSolver:
+    def __init__(self, board):
+        """
+        setups board, 3D-list for possible values
+        :param board: square numpy board, 9x9 or any other size supported by geometry
+        """
+        # Units, peers and values of the board's size, shared by every state
+        self.geometry = geometry = board_geometry(board)
+        self.impossible = np.full(geometry.shape, -1, dtype=int)
+        # A board that already contains a -1 is treated as the -1 board
+        self.final_board = self.impossible if -1 in board else board
+        # possible_values represents constraints. Allocate array or 1..9 for all cells (assume every value is possible in every cell)
+        self.possible_values = [[list(geometry.values) for _ in range(geometry.size)] for _ in range(geometry.size)]
+        # Kept up to date as values are removed and placed, so is_invalid, is_goal and get_singleton_cells don't have to
+        # scan the board: number of cells with no possible values, number of 0's in the board, and every cell that
+        # may have become a singleton (stale entries are dropped by get_singleton_cells)
+        self.empty_cells = 0
+        self.unfilled = int(np.count_nonzero(board == 0))
+        self.singletons = set()
+        # Units (indexes into geometry.unit_cells) that have lost possible values and not been checked for hidden
+        # singles and naked pairs since. setup leaves every unit to be checked by the first set_value
+        self.dirty_units = set()
+        # When not None, changes are recorded here instead of copying the state in set_value (see start_trail)
+        self.trail = None
+        self.copies_avoided = 0
+        # SolveStats shared by every state of the search, or None to not record any
+        self.stats = None
+        # TranspositionCache shared by every state of the search, or None to not remember dead states
+        self.cache = None
+
+    def setup(self):
+        """
+        Will setup the constraints array. Removes numbers that appear in the same row, column and square, for every cell
+        at once: the values of every cell's peers are gathered with the geometry's peer index array.
+        """
+        geometry = self.geometry
+        board = self.final_board.ravel()
+        # (cells, peers) values of every cell's peers
+        peer_values = board[geometry.peer_indexes]
+        # seen[cell, value] is True if value is held by one of the cell's peers; column 0 collects empty peers and any
+        # value out of range
+        seen = np.zeros((geometry.cell_count, geometry.size + 1), dtype=bool)
+        in_range = (peer_values > 0) & (peer_values <= geometry.size)
+        seen[np.arange(geometry.cell_count)[:, None], np.where(in_range, peer_values, 0)] = True
+        # A given is kept as the only possible value, unless it is out of range or a peer holds the same value
+        clashes = (peer_values == board[:, None]).any(axis=1).tolist()
+
+        possible_values = []
+        for cell, (value, allowed) in enumerate(zip(board.tolist(), (~seen[:, 1:]).tolist())):
+            if value != 0:
+                possible_values.append([] if clashes[cell] or not 0 < value <= geometry.size else [value])
+            else:
+                possible_values.append([option for option, ok in zip(geometry.values, allowed) if ok])
+        self.possible_values = [possible_values[row:row + geometry.size]
+                                for row in range(0, geometry.cell_count, geometry.size)]
+
+        self.empty_cells = sum(1 for values in possible_values if len(values) == 0)
+        self.singletons = {divmod(cell, geometry.size) for cell, values in enumerate(possible_values)
+                           if len(values) == 1}
+        self.dirty_units = set(range(len(geometry.units)))
+
+        if self.is_invalid():
+            self.final_board = self.impossible
+
+    def start_trail(self):
+        """
+        Switch this state to trail mode. set_value will then change this state in place and record every change on
+        the trail, so depth_first_search can undo back to an earlier point instead of keeping copies.
+        The board is copied once here so the caller's board is never written to.
+        """
+        self.trail = []
+        self.copies_avoided = 0
+        self.final_board = self.final_board.copy()
+
+    @property
+    def allocations_avoided(self):
+        """
+        :return: Estimated number of memory blocks that copy.deepcopy would have allocated for the copies avoided by
+            the trail (see allocations_per_copy)
+        """
+        return self.copies_avoided * allocations_per_copy(self.geometry.size)
+
+    def undo(self, mark):
+        """
+        Roll back every change recorded after the trail had length mark, newest first
+        :param mark: length of the trail to roll back to
+        """
+        trail = self.trail
+        while len(trail) > mark:
+            entry = trail.pop()
+            if entry[0] == TRAIL_REMOVED:
+                _, row, column, position, value = entry
+                values = self.possible_values[row][column]
+                if not values:
+                    self.empty_cells -= 1
+                    self.singletons.add((row, column))
+                values.insert(position, value)
+            elif entry[0] == TRAIL_PLACED:
+                _, row, column, values, board_value = entry
+                self.possible_values[row][column] = values
+                self.final_board[row, column] = board_value
+                if board_value == 0:
+                    self.unfilled += 1
+                if len(values) == 1:
+                    self.singletons.add((row, column))
+            elif entry[0] == TRAIL_UNITS:
+                self.dirty_units = entry[1]
+            else:
+                self.final_board = entry[1]
+
+    def remove_possible_value(self, row, column, value):
+        """
+        Remove a value from the possible values of a cell, recording it on the trail if there is one
+        :param row: row index (0..N-1)
+        :param column: column index (0..N-1)
+        :param value: value to remove, must be in the cell's possible values
+        """
+        values = self.possible_values[row][column]
+        position = values.index(value)
+        del values[position]
+        if len(values) == 1:
+            self.singletons.add((row, column))
+        elif not values:
+            self.empty_cells += 1
+        if self.trail is not None:
+            self.trail.append((TRAIL_REMOVED, row, column, position, value))
+
+    def place(self, row, column, value):
+        """
+        Put a value into the board and make it the only possible value of the cell, recording it on the trail if there
+        is one
+        :param row: row index (0..N-1)
+        :param column: column index (0..N-1)
+        :param value: value to place into board
+        """
+        if self.trail is not None:
+            self.trail.append((TRAIL_PLACED, row, column, self.possible_values[row][column],
+                               self.final_board[row, column]))
+        if self.final_board[row, column] == 0:
+            self.unfilled -= 1
+        self.possible_values[row][column] = [value]
+        self.final_board[row, column] = value
+
+    def mark_impossible(self):
+        """
+        Replace the board with the -1 board, recording it on the trail if there is one
+        """
+        if self.trail is not None:
+            self.trail.append((TRAIL_IMPOSSIBLE, self.final_board))
+        self.final_board = self.impossible
+
+    def is_goal(self):
+        """
+        Will return true if no 0's occur in board (and its not a -1 board).
+        We know this must be goal as code would not let us put an invalid choice in a cell, meaning all inputs were valid,
+        and no 0's = full board, hence goal is reached
+
+        :return: True if we have completed the sudoku
+        """
+        return self.unfilled == 0 and self.final_board is not self.impossible
+
+    def is_invalid(self):
+        """
+        Check if a -1 exists in the board, or if we run out of possible values for a cell.
+        The only way a -1 gets into the board is by it becoming the -1 board, and the number of cells without possible
+        values is counted as values are removed, so this is O(1).
+        :return: True if above condition is met, else False
+        """
+        if self.stats is not None:
+            self.stats.invalid_checks += 1
+        return self.empty_cells > 0 or self.final_board is self.impossible
+
+    def get_possible_values(self, row, column):
+        """
+        Get a copy of the possible values for a given cell
+        :param row: row index (0..N-1)
+        :param column: column index (0..N-1)
+        :return: A copy of all potential values at given cell
+        """
+        size = self.geometry.size
+        if not (0 <= row < size and 0 <= column < size):
+            raise ValueError(f"Invalid index for selecting row: {row} and column: {column}")
+
+        return self.possible_values[row][column].copy()
+
+    def count_possible_values(self):
+        """
+        :return: Total number of possible values over all cells
+        """
+        return sum(len(values) for row in self.possible_values for values in row)
+
+    def get_singleton_cells(self):
+        """
+        Returns the row and column indexes which have no final value but exactly 1 possible value
+        :return: Array containing the above. Order is left to right, top to bottom
+        """
+        out = sorted((row, column) for row, column in self.singletons
+                     if len(self.possible_values[row][column]) == 1 and self.final_board[row, column] == 0)
+        # Drop the cells that are no longer singletons
+        self.singletons = set(out)
+
+        return out
+
+    def find_hidden_singles(self, unit):
+        """
+        Hidden Singles
+        find the values that appear only once in one row, column or square
+        :param unit: index into geometry.unit_cells
+        :return: list of (row, column, value) for each hidden single whose cell is still unfilled (0)
+        """
+        ls = [[] for _ in range(self.geometry.size)]
+        for row, column in self.geometry.unit_cells[unit]:
+            for value in self.possible_values[row][column]:
+                # acts like a dictionary; counting occurrences of a value in the unit by storing indexes
+                ls[value - 1].append((row, column))
+
+        return [(cells[0][0], cells[0][1], value) for value, cells in enumerate(ls, 1)
+                if len(cells) == 1 and self.final_board[cells[0]] == 0]
+
+    def eliminate_naked_pairs(self, unit):
+        """
+        A naked pair is a pair of identical cells in the same row, column, or square that contain exactly 2 options.
+        Example: https://www.learn-sudoku.com/naked-pairs.html
+        Remove both values from the other cells of one row, column or square
+        :param unit: index into geometry.unit_cells
+        :return: list of (row, column) of every cell that had possible values removed
+        """
+        cells = self.geometry.unit_cells[unit]
+        changed = []
+
+        for i in range(len(cells)):
+            pair = self.possible_values[cells[i][0]][cells[i][1]]
+            if len(pair) != 2:
+                continue
+            for j in range(i + 1, len(cells)):
+                if self.possible_values[cells[j][0]][cells[j][1]] != pair:
+                    continue
+                # Found a naked pair, remove both values from all other cells of the unit
+                for k, (row, column) in enumerate(cells):
+                    if k == i or k == j:
+                        continue
+                    for value in tuple(pair):
+                        if value in self.possible_values[row][column]:
+                            self.remove_possible_value(row, column, value)
+                            changed.append((row, column))
+                    if self.is_invalid():
+                        return changed
+
+        return changed
+
+    def set_value(self, row, column, value, technique="guess"):
+        """
+        Function to place a value in a cell and update constraints in other cells, where appropriate.
+        :param row: row index (0..N-1)
+        :param column: column index (0..N-1)
+        :param value: value to place into board
+        :param technique: what placed the value, for stats
+        :return: class (type: SudokuSolver) with updated board
+        """
+        if self.is_invalid():
+            return self
+
+        # can't place this value in cell as it is not in the possible values for this cell
+        if value not in self.possible_values[row][column]:
+            self.mark_impossible()
+            return self
+
+        # create a copy of self so as not to loose current state in case we need to roll back to it.
+        # In trail mode, changes are recorded on the trail instead and depth_first_search undoes them
+        if self.trail is None:
+            state = copy.deepcopy(self)
+        else:
+            state = self
+            state.copies_avoided += 1
+
+        if state.stats is not None:
+            state.stats.set_value_calls += 1
+        state.propagate([(row, column, value, technique)])
+
+        return state
+
+    def propagate(self, placements):
+        """
+        Place values, and everything that follows from them, until nothing more can be placed or removed.
+        Works from two queues rather than rescanning the board (or recursing): values waiting to be placed, and the
+        rows, columns and squares (units) that have lost possible values since they were last checked. Only those units
+        are checked again for hidden singles and naked pairs.
+        :param placements: list of (row, column, value, technique) to place
+        :return: no return; the state is marked impossible if a contradiction is found
+        """
+        stats = self.stats
+        size = self.geometry.size
+        peer_cells = self.geometry.peer_cells
+        cell_unit_indexes = self.geometry.cell_unit_indexes
+        pending = deque(placements)
+        # Cells that are already singletons, e.g. straight after setup
+        pending.extend((row, column, self.possible_values[row][column][0], "naked_single")
+                       for row, column in self.get_singleton_cells())
+
+        # Units still to check, in the order they were touched. Units left over from setup are checked first
+        if self.trail is not None and self.dirty_units:
+            self.trail.append((TRAIL_UNITS, self.dirty_units))
+        units = deque(sorted(self.dirty_units))
+        queued = set(self.dirty_units)
+        self.dirty_units = set()
+
+        while not self.is_invalid():
+            if pending:
+                row, column, value, technique = pending.popleft()
+                if self.final_board[row, column] != 0:
+                    # Already placed; two different values forced into one cell is a contradiction
+                    if self.final_board[row, column] != value:
+                        break
+                    continue
+                if value not in self.possible_values[row][column]:
+                    break
+
+                if stats is not None:
+                    stats.begin(technique)
+                    stats.placed(row, column, value, technique)
+                    removed = len(self.possible_values[row][column]) - 1
+
+                # place value into cell, update possible_values for the cell's row, column and square
+                self.place(row, column, value)
+                touched = [(row, column)]
+                for peer_row, peer_column in peer_cells[row * size + column]:
+                    if value in self.possible_values[peer_row][peer_column]:
+                        self.remove_possible_value(peer_row, peer_column, value)
+                        touched.append((peer_row, peer_column))
+                        # Insert values where we know there are no other possible values for that cell
+                        if len(self.possible_values[peer_row][peer_column]) == 1 and \
+                                self.final_board[peer_row, peer_column] == 0:
+                            pending.append((peer_row, peer_column, self.possible_values[peer_row][peer_column][0],
+                                            "naked_single"))
+
+                if stats is not None:
+                    stats.eliminations[technique] += removed + len(touched) - 1
+                    stats.end()
+            elif units:
+                unit = units.popleft()
+                queued.discard(unit)
+
+                if stats is not None:
+                    stats.begin("hidden_single")
+                hidden_singles = self.find_hidden_singles(unit)
+                if stats is not None:
+                    stats.end()
+                if hidden_singles:
+                    # Placing them queues this unit to be checked again
+                    pending.extend((row, column, value, "hidden_single") for row, column, value in hidden_singles)
+                    touched = []
+                else:
+                    if stats is not None:
+                        stats.begin("naked_pair")
+                        possible_values_count = self.count_possible_values()
+                    touched = self.eliminate_naked_pairs(unit)
+                    if stats is not None:
+                        stats.eliminations["naked_pair"] += possible_values_count - self.count_possible_values()
+                        stats.end()
+                    pending.extend((row, column, self.possible_values[row][column][0], "naked_single")
+                                   for row, column in touched
+                                   if len(self.possible_values[row][column]) == 1 and self.final_board[row, column] == 0)
+            else:
+                return
+
+            # Queue the units of every cell that lost possible values
+            for row, column in touched:
+                for touched_unit in cell_unit_indexes[row * size + column]:
+                    if touched_unit not in queued:
+                        queued.add(touched_unit)
+                        units.append(touched_unit)
+
+        self.mark_impossible()
+
+
+@lru_cache(maxsize=None)
+def allocations_per_copy(size):
+    """
+    Measure the memory blocks one copy.deepcopy of a SudokuSolver keeps allocated: the instance, its lists of
+    possible_values, its sets and numpy arrays. It is sampled once per size, on an empty board after setup; every state
+    of a search holds the same number of lists, so it is a close estimate for all of them.
+    :param size: board size
+    :return: number of blocks, as counted by sys.getallocatedblocks
+    """
+    state = SudokuSolver(np.zeros((size, size), dtype=int))
+    state.setup()
+    # A first copy warms up copy's own caches, and the garbage collector is paused so it cannot free blocks mid-count
+    copy.deepcopy(state)
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        state_copy = copy.deepcopy(state)
+        blocks = sys.getallocatedblocks() - before
+    finally:
+        if collecting:
+            gc.enable()
+    del state_copy
+    return blocks
+
+
+def pick_next_cell(state):
+    """
+    Choose the best cell to try values on.
+    :param state: A SudokuSolver class
+    :return: A tuple of form (row, column) with index of the cell we should try values for
+    """
+    indexes = [[] for _ in range(state.geometry.size + 1)]
+
+    # Iterate over board, indexing each 0 cell in a list, based on the amount of possible values for that cell
+    # e.g. for cell (1,1) with possible_values = [1,2,3], we set indexes[3] to be
+    for index, row in enumerate(state.possible_values):
+        for item_index, item in enumerate(row):
+            if state.final_board[index, item_index] == 0:
+                indexes[len(item)].append((index, item_index))
+
+    out = None
+
+    for item in indexes:
+        if item != []:
+            out = item
+            break
+
+    return out[0]
+
+
+def order_values(state, index):
+    """
+    Order the possible values for a cell by certain set of rules.
+    :param state: A SudokuSolver class
+    :param index: A tuple of form (row, column) with index of the cell we are ordering values for
+    :return: an array of values from possible_values of index
+    """
+
+    geometry = state.geometry
+    possible_values = state.possible_values
+    values = possible_values[index[0]][index[1]]
+
+    # Create dictionary, keys will be values found at the index of possible_values.
+    # Each item will be the minimum number of times the key occurs in the cell's row, column or square (counting the
+    # cell itself, so at least 1)
+    values_hash_rows = {}
+    units = [geometry.unit_cells[unit] for unit in geometry.cell_unit_indexes[index[0] * geometry.size + index[1]]]
+
+    for value in values:
+        values_hash_rows[value] = min(sum(1 for row, column in unit if value in possible_values[row][column])
+                                      for unit in units)
+
+    # create list from dict, sort it by the number occurences for each value
+    values, count = zip(*sorted(list(values_hash_rows.items()), key=lambda x: x[1]))
+
+    return values
+
+
+def depth_first_search(state, trail=False, budget=None):
+    """
+    Depth first search on sudoku, with help from constraint propagation.
+    Based on function of same name from eight queens revisited notebook, with the recursion replaced by a stack of
+    nodes, so the depth of the search is only bounded by the number of cells and not by Python's recursion limit.
+    :param state: A SudokuSolver class
+    :param trail: If True, search in place on state and undo changes when backtracking, instead of copying the state
+        for every placement. state.copies_avoided and state.allocations_avoided then count the copies saved
+    :param budget: optional SearchBudget; if it runs out the search gives up, returning None with budget.exhausted set
+    :return: None if given sudoku has no solution, else returns a finished solution
+    """
+    stats = state.stats
+    cache = state.cache
+    if budget is not None and budget.spend():
+        return None
+    if stats is not None:
+        stats.enter_node(state)
+    if state.is_invalid():
+        if stats is not None:
+            stats.exit_node(state, None)
+        return None
+    if trail and state.trail is None:
+        state.start_trail()
+
+    # One frame per node being searched, root first: [state, cell, values left to try, key of the child searched,
+    # trail mark to undo to]
+    stack = [search_frame(state)]
+    while stack:
+        frame = stack[-1]
+        node, index, values, _, _ = frame
+        value = next(values, None)
+        if value is None:
+            # if no values can go in the cell we choose, then sudoku is unsolvable from this node: leave it, and
+            # backtrack in its parent
+            stack.pop()
+            if stats is not None:
+                stats.exit_node(node, None)
+            if stack:
+                parent = stack[-1]
+                if parent[3] is not None:
+                    cache.mark_dead(parent[3])
+                if stats is not None:
+                    stats.backtracks += 1
+                if trail:
+                    parent[0].undo(parent[4])
+            continue
+
+        frame[4] = len(node.trail) if trail else 0
+        if stats is not None:
+            stats.values_tried[index] += 1
+        # Place value in cell
+        new_state = node.set_value(index[0], index[1], value)
+        if new_state.is_goal():
+            leave_nodes(stack, stats, new_state)
+            return new_state
+        # then if not invalid, go deeper, and try all values in the next cell.
+        # A state already known to have no solution (a dead state) is skipped
+        if not new_state.is_invalid():
+            key = None if cache is None else board_key(new_state.final_board)
+            if key is None or not cache.is_dead(key):
+                if budget is not None and budget.spend():
+                    leave_nodes(stack, stats, None)
+                    return None
+                if stats is not None:
+                    stats.enter_node(new_state)
+                frame[3] = key
+                stack.append(search_frame(new_state))
+                continue
+        if stats is not None:
+            stats.backtracks += 1
+        if trail:
+            node.undo(frame[4])
+
+    return None
+
+
+def search_frame(state):
+    """
+    Choose the cell to branch on at a depth_first_search node
+    :param state: A SudokuSolver class, which is not invalid
+    :return: the node's stack frame
+    """
+    stats = state.stats
+    if stats is not None:
+        stats.begin("search")
+    index = pick_next_cell(state)
+    values = order_values(state, index)
+    if stats is not None:
+        stats.end()
+    return [state, index, iter(values), None, 0]
+
+
+def sudoku_solver(board, engine=DEFAULT_ENGINE, trail=False, stats=None, cache=None, techniques=None, max_nodes=None,
+                  timeout=None):
+    """
+    Solves a Sudoku puzzle and returns its unique solution.
+
+    Input
+        sudoku : 9x9 numpy array
+            Empty cells are designated by 0. Larger boards of any square size, such as 16x16 (values 1..16) and 25x25,
+            are solved too.
+        engine : "bitmask" (default), "list" or "dlx"
+            "list" is the original engine, holding each cell's candidates as a list.
+            "bitmask" stores candidates as bit masks instead of lists and returns the same result, faster.
+            "dlx" solves the sudoku as an exact cover problem with Algorithm X.
+        trail : bool
+            For the "list" engine, backtrack by undoing a trail of changes instead of copying the state on every
+            placement.
+        stats : None, True or SolveStats
+            If given, statistics of the solve are recorded (into a new SolveStats if True) and returned as well.
+        cache : None or TranspositionCache
+            If given, the result is looked up in the cache first and stored in it afterwards, and the "list" and
+            "bitmask" engines remember every dead state their search reaches, skipping it if it comes up again.
+        techniques : None or sequence of technique names
+            For the "bitmask" engine, the deduction techniques to run after every placement, in order (see
+            bitmask.ALL_TECHNIQUES). None runs bitmask.DEFAULT_TECHNIQUES: naked singles, hidden singles and naked
+            pairs.
+        max_nodes : None or int
+            Give up once the search has entered this many nodes.
+        timeout : None or float
+            Give up once the search has run for this many seconds.
+
+    Output
+        numpy array of integers, the same shape as sudoku
+            It contains the solution, if there is one. If there is no solution, all array entries should be -1.
+            If the solver gave up (max_nodes or timeout ran out), all array entries are 0.
+        If stats is given, a tuple of (the above array, SolveStats) is returned instead; the stats cover the search up
+        to where it stopped, and stats.gave_up says why it gave up, if it did.
+    """
+    if techniques is not None:
+        if engine != "bitmask":
+            raise ValueError(f"Techniques can only be chosen for the bitmask engine, not {engine}")
+        techniques = check_techniques(techniques)
+    budget = None if max_nodes is None and timeout is None else SearchBudget(max_nodes, timeout)
+
+    if not stats:
+        return solve(board, engine, trail, None, cache, techniques, budget)
+
+    if stats is True:
+        stats = SolveStats()
+    began = time.perf_counter()
+    solution = solve(board, engine, trail, stats, cache, techniques, budget)
+    if budget is not None:
+        stats.gave_up = budget.exhausted
+    stats.seconds += time.perf_counter() - began
+    return solution, stats
+
+
+def solve(board, engine, trail, stats, cache, techniques, budget):
+    """
+    Body of sudoku_solver
+    """
+    # An out of range board has no solution, and its digest could be the key of a real board
+    if cache is None or not in_range(board):
+        return solve_engine(board, engine, trail, stats, None, techniques, budget)
+
+    key = board_key(board)
+    value = cache.get(key)
+    if value is not None:
+        return board_from_key(value, board)
+    solution = solve_engine(board, engine, trail, stats, cache, techniques, budget)
+    # A search that gave up has not shown the board has no solution
+    if budget is not None and budget.exhausted:
+        return solution
+    cache.put(key, NO_SOLUTION if (solution == -1).all() else board_key(solution))
+    return solution
+
+
+def solve_engine(board, engine, trail, stats, cache, techniques, budget):
+    """
+    Solve a board with one engine
+    :return: the solution, the -1 board if there is none, or the 0 board if the budget ran out
+    """
+    if engine == "bitmask":
+        s = BitmaskSudokuSolver(board)
+        s.stats = stats
+        s.cache = cache
+        if techniques is not None:
+            s.techniques = techniques
+        s.setup()
+        if s.is_invalid():
+            return s.impossible
+        if s.is_goal():
+            return s.final_board
+        solved_sudoku = bitmask_depth_first_search(s, budget)
+        if solved_sudoku is None:
+            return gave_up_board(s, budget)
+        return solved_sudoku.final_board
+    if engine == "dlx":
+        s = DancingLinksSolver(board)
+        s.stats = stats
+        s.setup()
+        if s.is_invalid():
+            return s.impossible
+        solved_sudoku = dlx_depth_first_search(s, budget)
+        if solved_sudoku is None:
+            return gave_up_board(s, budget)
+        return solved_sudoku.final_board
+    if engine != "list":
+        raise ValueError(f"Unknown engine: {engine}, expected one of {ENGINES}")
+
+    # YOUR CODE HERE
+    s = SudokuSolver(board)
+    s.stats = stats
+    s.cache = cache
+    s.setup()
+    if s.is_invalid():
+        return s.impossible
+    if s.is_goal():
+        return s.final_board
+    solved_sudoku = depth_first_search(s, trail, budget)
+    if trail and stats is not None:
+        stats.copies_avoided += s.copies_avoided
+        stats.allocations_avoided += s.allocations_avoided
+    if solved_sudoku is None:
+        return gave_up_board(s, budget)
+
+    return solved_sudoku.final_board
+
+
+def gave_up_board(state, budget):
+    """
+    Result of a search that found no solution
+    :param state: the root state of the search
+    :param budget: SearchBudget of the search, or None
+    :return: the 0 board if the budget ran out, else the -1 board
+    """
+    if budget is not None and budget.exhausted:
+        return np.zeros_like(state.impossible)
+    return state.impossible
@@ -0,0 +1,121 @@
+import time
+from collections import Counter, defaultdict
+
+
+class SolveStats:
+    """
+    Statistics for a single solve. Pass one to sudoku_solver(board, stats=...) (or set it as state.stats before a
+    depth first search) and the solver fills it in as it goes.
+
+    One SolveStats is shared by every state of a search; copying a state does not copy its stats.
+    When a state's stats is None, the solver skips all of this, so solving without stats costs nothing extra beyond
+    a few `is None` checks per placement.
+    """
+
+    def __init__(self, on_node_enter=None, on_node_exit=None, on_placement=None):
+        """
+        :param on_node_enter: called as on_node_enter(state, depth) when the depth first search enters a node
+        :param on_node_exit: called as on_node_exit(state, depth, result) when it leaves one; result is None if no
+            solution was found below the node
+        :param on_placement: called as on_placement(row, column, value, technique) whenever a value is placed
+        """
+        self.on_node_enter = on_node_enter
+        self.on_node_exit = on_node_exit
+        self.on_placement = on_placement
+
+        self.nodes = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.backtracks = 0
+        self.set_value_calls = 0
+        self.invalid_checks = 0
+        # Copies of the state, and the memory blocks they would have allocated, saved by the list engine's trail
+        self.copies_avoided = 0
+        self.allocations_avoided = 0
+        self.seconds = 0.0
+        # None, or why the search gave up before finishing: "max_nodes" or "timeout" (see budget.SearchBudget)
+        self.gave_up = None
+        # (row, column) -> number of values the search tried in that cell
+        self.values_tried = Counter()
+        # technique -> number of values placed / candidates removed by it, and number of times it changed the board
+        self.placements = Counter()
+        self.eliminations = Counter()
+        self.fired = Counter()
+        # technique -> seconds spent in it, not counting time spent in other techniques it led to
+        self.time = defaultdict(float)
+
+        self.timers = []
+        self.since = 0.0
+
+    def __deepcopy__(self, memo):
+        # Shared between all states of a search
+        return self
+
+    def enter_node(self, state):
+        self.nodes += 1
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+        if self.on_node_enter is not None:
+            self.on_node_enter(state, self.depth)
+
+    def exit_node(self, state, result):
+        if self.on_node_exit is not None:
+            self.on_node_exit(state, self.depth, result)
+        self.depth -= 1
+
+    def placed(self, row, column, value, technique):
+        self.placements[technique] += 1
+        if self.on_placement is not None:
+            self.on_placement(row, column, value, technique)
+
+    def begin(self, technique):
+        """
+        Start timing a technique. The technique that was being timed is paused until the matching end()
+        """
+        now = time.perf_counter()
+        if self.timers:
+            self.time[self.timers[-1]] += now - self.since
+        self.timers.append(technique)
+        self.since = now
+
+    def end(self):
+        """
+        Stop timing the latest technique, and carry on timing the one before it
+        """
+        now = time.perf_counter()
+        self.time[self.timers.pop()] += now - self.since
+        self.since = now
+
+    def as_dict(self):
+        """
+        :return: the statistics as a dict of plain types (e.g. to save as JSON)
+        """
+        return {
+            "seconds": self.seconds,
+            "nodes": self.nodes,
+            "max_depth": self.max_depth,
+            "backtracks": self.backtracks,
+            "set_value_calls": self.set_value_calls,
+            "invalid_checks": self.invalid_checks,
+            "copies_avoided": self.copies_avoided,
+            "allocations_avoided": self.allocations_avoided,
+            "gave_up": self.gave_up,
+            "values_tried": {f"{row},{column}": count for (row, column), count in sorted(self.values_tried.items())},
+            "placements": dict(self.placements),
+            "eliminations": dict(self.eliminations),
+            "fired": dict(self.fired),
+            "time": dict(self.time),
+        }
+
+
+def leave_nodes(stack, stats, result):
+    """
+    Leave every node on a search stack, deepest first, when the search stops early
+    :param stack: stack of frames, each holding its state first
+    :param stats: SolveStats or None
+    :param result: the solution found, or None when giving up
+    """
+    if stats is not None:
+        for frame in reversed(stack):
+            stats.exit_node(frame[0], result)
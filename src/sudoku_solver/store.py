@@ -0,0 +1,117 @@
+import sqlite3
+
+import numpy as np
+
+from .cache import NO_SOLUTION, board_from_key, board_key
+from .solver import DEFAULT_ENGINE, sudoku_solver
+from .symmetry import canonical_form
+
+# Boards looked up in one SELECT; SQLite allows 999 parameters per statement in older versions
+LOOKUP_CHUNK = 900
+
+
+class SolutionStore:
+    """
+    Persistent map from canonical boards to their solutions, kept in an SQLite file.
+    Keys and values are board digests (see cache.board_key) of canonical boards; a puzzle with no solution is stored
+    as NO_SOLUTION. Use solve_stored to solve puzzles through it.
+    """
+
+    def __init__(self, path=":memory:"):
+        """
+        Open (or create) a store
+        :param path: path of the SQLite file, or ":memory:" for a store that is not saved
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (board BLOB PRIMARY KEY, solution BLOB NOT NULL)")
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def get_many(self, keys):
+        """
+        Look up canonical boards, counting hits and misses
+        :param keys: list of board digests
+        :return: dict of digest -> solution digest (or NO_SOLUTION), for the boards found
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            found.update(self.connection.execute(
+                f"SELECT board, solution FROM solutions WHERE board IN ({', '.join('?' * len(chunk))})", chunk))
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """
+        Store the solutions of canonical boards, in one transaction
+        :param items: iterable of (board digest, solution digest or NO_SOLUTION)
+        """
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO solutions (board, solution) VALUES (?, ?)", items)
+
+    def as_dict(self):
+        """
+        :return: the counters as a dict of plain types
+        """
+        return {"path": self.path, "entries": len(self), "hits": self.hits, "misses": self.misses}
+
+
+def solve_stored(puzzles, store, engine=DEFAULT_ENGINE):
+    """
+    Solve a stack of puzzles through a SolutionStore.
+    Every puzzle is mapped to its canonical form (symmetry.canonical_form), so a puzzle that is a relabelled,
+    reordered or transposed copy of one solved before is answered by looking up the canonical board and transforming
+    its stored solution back. Canonical boards that are not in the store are solved with sudoku_solver and added.
+
+    Input
+        puzzles : (N, size, size) numpy array
+            Empty cells are designated by 0.
+        store : SolutionStore
+        engine : engine passed to sudoku_solver
+
+    Output
+        (N, size, size) numpy array, same dtype as puzzles
+            Each board contains a solution, if there is one. If there is no solution, all its entries are -1.
+            For a puzzle with more than one solution this is a solution of its canonical board, which need not be the
+            one sudoku_solver would return.
+    """
+    puzzles = np.asarray(puzzles)
+    size = puzzles.shape[-1]
+    # Boards with values out of range have no canonical form, and no solution
+    valid = ((puzzles >= 0) & (puzzles <= size)).all(axis=(1, 2))
+    solutions = np.full(puzzles.shape, -1, dtype=np.int64)
+    if not valid.any():
+        return solutions.astype(puzzles.dtype)
+
+    canonical, transform = canonical_form(puzzles[valid])
+    keys = [board.tobytes() for board in canonical]
+    found = store.get_many(keys)
+    added = {}
+    canonical_solutions = np.empty(canonical.shape, dtype=np.int64)
+    for index, key in enumerate(keys):
+        value = found.get(key, added.get(key))
+        if value is None:
+            solution = sudoku_solver(canonical[index], engine=engine)
+            value = added[key] = NO_SOLUTION if (solution == -1).all() else board_key(solution)
+        canonical_solutions[index] = board_from_key(value, canonical[index])
+    if added:
+        store.put_many(added.items())
+
+    solutions[valid] = transform.invert(canonical_solutions)
+    return solutions.astype(puzzles.dtype)